@@ -0,0 +1,127 @@
+import contextvars, os, threading, time
+from functools import partial
+from concurrent.futures import Future, wait
+from copilot.tools.prom import window_mean
+from copilot.tools.trace import span
+from copilot.tools.k8s import pod_table, events, get_json, namespaces
+from copilot.tools.podrecords import PodTable
+from copilot.tools.loki import (top_errors_by_pod, sample_error_signatures,
+                                top_errors_by_namespace, error_signatures_by_namespace)
+
+DEADLINE_S = float(os.getenv("AGENT_DEADLINE_S", "20"))
+
+# value used when a source fails or misses the deadline
+DEFAULTS = {"err": 0.0, "tot": 0.0, "pods": PodTable(), "events": {}, "by_pod": [], "sigs": []}
+
+# how long (seconds) a fetched source stays fresh in watch mode
+TTLS = {"err": 30, "tot": 30, "pods": 15, "events": 30, "by_pod": 60, "sigs": 60, "logs": 30}
+
+# sources with a TTL but no job: the worst pod's log tail depends on the pod
+# table, so evaluate() fetches it; refresh() only bumps its version when the
+# TTL expires, which re-derives the sections that read it
+TICKS = ("logs",)
+
+# 1m rates sampled every minute and averaged over the window (prom.window_mean),
+# so a run only fetches the minutes the range cache hasn't seen yet
+def queries(window_min):
+    err_q = '(sum(rate(apiserver_request_total{code=~"5.."}[1m])) or on() vector(0))'
+    tot_q = 'clamp_min(sum(rate(apiserver_request_total[1m])), 1e-12)'
+    return err_q, tot_q
+
+def _jobs(namespace, window_min):
+    err_q, tot_q = queries(window_min)
+    return {
+        "err": (window_mean, err_q, window_min),
+        "tot": (window_mean, tot_q, window_min),
+        "pods": (pod_table, namespace),
+        "events": (events, namespace),
+        "by_pod": (top_errors_by_pod, namespace, window_min),
+        "sigs": (sample_error_signatures, namespace, window_min, None, 10),
+    }
+
+def _source(name, fn, *args):
+    with span(f"source:{name}"):
+        return fn(*args)
+
+def _run(fut, name, job):
+    if not fut.set_running_or_notify_cancel(): return
+    try: fut.set_result(_source(name, *job))
+    except BaseException as e: fut.set_exception(e)
+
+def _fetch(jobs, deadline):
+    """Run {name: (fn, *args)} in parallel under one deadline.
+    Returns ({name: value}, [names that failed or missed the deadline])."""
+    futs = {n: Future() for n in jobs}
+    for n, job in jobs.items():
+        # daemon threads: a straggler past the deadline can't be cancelled,
+        # but it is abandoned rather than joined at interpreter exit
+        threading.Thread(target=contextvars.copy_context().run, args=(_run, futs[n], n, job),
+                         name=f"source:{n}", daemon=True).start()
+    wait(futs.values(), timeout=deadline)
+    got, missing = {}, []
+    for n, f in futs.items():
+        if f.done() and f.exception() is None: got[n] = f.result()
+        else: missing.append(n)
+    return got, missing
+
+class Collector:
+    """Keeps the last value of every source. refresh() refetches, in
+    parallel and under one deadline, only the sources whose TTL expired, and
+    bumps a per-source version whenever a refetched value actually changed."""
+
+    def __init__(self, namespace="default", window_min=5, ttls=None, deadline=DEADLINE_S):
+        self.jobs = _jobs(namespace, window_min)
+        self.ttls = dict(TTLS, **(ttls or {}))
+        self.deadline = deadline
+        self.values = dict(DEFAULTS)
+        self.fetched = {}
+        self.versions = {name: 0 for name in (*self.jobs, *TICKS)}
+
+    def refresh(self, force=False):
+        now = time.monotonic()
+        due = [n for n in (*self.jobs, *TICKS)
+               if force or n not in self.fetched or now - self.fetched[n] >= self.ttls[n]]
+        for n in TICKS:
+            if n in due:
+                due.remove(n); self.fetched[n] = now; self.versions[n] += 1
+        missing = []
+        if due:
+            # missing sources keep their last good value; retried on the next refresh
+            got, missing = _fetch({n: self.jobs[n] for n in due}, self.deadline)
+            for n, val in got.items():
+                self.fetched[n] = now
+                if val != self.values[n]:
+                    self.values[n] = val; self.versions[n] += 1
+        snap = dict(self.values)
+        snap["missing"] = missing
+        snap["versions"] = dict(self.versions)
+        return snap
+
+def collect(namespace="default", window_min=5, deadline=DEADLINE_S):
+    """Fetch every independent source once, in parallel, under one deadline."""
+    return Collector(namespace, window_min, deadline=deadline).refresh()
+
+# fleet mode: cluster-wide lists and Loki queries keyed by namespace
+FLEET_DEFAULTS = {"err": 0.0, "tot": 0.0, "pods": PodTable(), "events": {}, "by_pod": {}, "sigs": {}, "namespaces": None}
+
+def collect_fleet(window_min=5, selector=None, deadline=DEADLINE_S):
+    """One cluster-wide fetch for a fleet sweep: all pods, all events, one
+    `sum by (namespace, pod)` Loki query and one ERROR-line stream mined per
+    namespace. With a namespace label selector, also the matching names."""
+    err_q, tot_q = queries(window_min)
+    jobs = {
+        "err": (window_mean, err_q, window_min),
+        "tot": (window_mean, tot_q, window_min),
+        "pods": (pod_table, None, True),
+        "events": (get_json, "events", None, True),
+        "by_pod": (top_errors_by_namespace, window_min),
+        # same signature limit per namespace as a single-namespace run (_jobs)
+        "sigs": (partial(error_signatures_by_namespace, limit=10), window_min),
+    }
+    if selector: jobs["namespaces"] = (namespaces, selector)
+    got, missing = _fetch(jobs, deadline)
+    snap = dict(FLEET_DEFAULTS, **got)
+    if selector and "namespaces" not in got:
+        snap["namespaces"] = []   # never widen a selector sweep to the whole cluster
+    snap["missing"] = missing
+    return snap
@@ -0,0 +1,91 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from agent.collect import DEFAULTS, TICKS, collect_fleet
+from copilot.tools.podrecords import PodTable
+from agent.run import evaluate, render, classify, crashy_pods, _burn, _write_atomic
+from copilot.tools.trace import span, trace, submit, summary
+
+CONCURRENCY = int(os.getenv("FLEET_CONCURRENCY", "8"))
+
+def partition(snap):
+    """Split one cluster-wide snapshot into per-namespace snapshots shaped
+    like Collector.refresh() output, so agent.run.evaluate works unchanged."""
+    pods_by, ev_by = snap["pods"].by_namespace(), {}
+    for it in snap["events"].get("items", []):
+        ev_by.setdefault(it.get("metadata", {}).get("namespace", ""), []).append(it)
+    names = set(pods_by) | set(snap["by_pod"]) | set(snap["sigs"])
+    if snap.get("namespaces") is not None:
+        names &= set(snap["namespaces"])
+    names.discard("")
+    versions = {n: 0 for n in (*DEFAULTS, *TICKS)}
+    return {ns: {"err": snap["err"], "tot": snap["tot"],
+                 "pods": pods_by.get(ns) or PodTable(), "events": {"items": ev_by.get(ns, [])},
+                 "by_pod": snap["by_pod"].get(ns, []), "sigs": snap["sigs"].get(ns, []),
+                 "missing": snap["missing"], "versions": versions}
+            for ns in sorted(names)}
+
+def _rank(r):
+    warnings = sum(n for _, n in r["top_warning_events"])
+    rate = sum(x["rate"] for x in r["loki_error_rate_by_pod"])
+    return (len(r["crashy_pods"]), rate, len(r["delta"].get("new", [])), warnings)
+
+def sweep(window_min=5, selector=None, concurrency=CONCURRENCY):
+    """Evaluate every namespace (or those matching a label selector) from one
+    bulk fetch; namespaces run in parallel, at most `concurrency` at a time.
+    Returns (fleet snapshot, reports ranked worst first)."""
+    with span("collect"):
+        snap = collect_fleet(window_min, selector)
+    with span("partition") as sp:
+        parts = partition(snap)
+        sp.set(items=len(parts))
+    def one(ns):
+        s = parts[ns]
+        # tail the worst pod's logs only where something looks wrong
+        tail = bool(s["by_pod"] or s["sigs"] or crashy_pods(s["pods"]))
+        with span("namespace", namespace=ns):
+            try: return evaluate(ns, window_min, s, tail_logs=tail)
+            except Exception as e: return {"namespace": ns, "error": str(e)}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as ex:
+        reports = [f.result() for f in [submit(ex, one, ns) for ns in parts]]
+    ok = sorted((r for r in reports if "error" not in r), key=_rank, reverse=True)
+    return snap, ok + [r for r in reports if "error" in r]
+
+def render_summary(snap, reports, window_min, spans=None):
+    err_rate, br = _burn(snap, window_min)
+    hot = [r for r in reports if "error" not in r and any(_rank(r)[:3])]
+    md = [f"# On-Call Copilot — Fleet Report ({datetime.utcnow().isoformat()}Z)\n",
+          f"**TL;DR**: {classify(br)} — cluster burn={br:.2f}x over {window_min}m, err_rate={err_rate:.3%}; "
+          f"{len(hot)} of {len(reports)} namespaces need attention.\n"]
+    if snap["missing"]:
+        md.append("Sources unavailable (failed or past deadline): " + ", ".join(snap["missing"]) + "\n")
+    cut = next((v.last_ts for v in snap["sigs"].values() if getattr(v, "truncated", False)), None)
+    if cut is not None:
+        at = datetime.utcfromtimestamp(cut / 1e9).strftime("%H:%M:%SZ")
+        md.append(f"Error signatures only cover logs up to {at}: Loki page cap (LOKI_MAX_PAGES) reached\n")
+    md += ["## Namespaces (worst first)",
+           "| # | Namespace | Crash/backoff | ERROR/s | New sigs | Warnings | Worst pod | Report |",
+           "|---|---|---|---|---|---|---|---|"]
+    for i, r in enumerate(reports, 1):
+        ns = r["namespace"]
+        if "error" in r:
+            md.append(f"| {i} | {ns} | - | - | - | - | - | failed: {r['error']} |"); continue
+        crash, rate, new, warn = _rank(r)
+        md.append(f"| {i} | {ns} | {crash} | {rate:.3f} | {new} | {warn} | {r['worst_pod'] or '-'} | [{ns}.md]({ns}.md) |")
+    if spans:
+        md.append("\n## Timing")
+        md += summary(spans)
+    return "\n".join(md)
+
+def main(window_min=5, selector=None, outdir="out/fleet", concurrency=CONCURRENCY):
+    os.makedirs(outdir, exist_ok=True)
+    with trace("agent.fleet", selector=selector or "", window_min=window_min) as t:
+        snap, reports = sweep(window_min, selector, concurrency)
+    for r in reports:
+        if "error" not in r:
+            _write_atomic(os.path.join(outdir, f"{r['namespace']}.md"), render(r))
+    text = render_summary(snap, reports, window_min, t.to_dict())
+    path = os.path.join(outdir, "index.md")
+    _write_atomic(path, text)
+    print(text)
+    print(f"\n[Saved] {path} (+{len(reports)} namespace reports)")
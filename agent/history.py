@@ -1,21 +1,160 @@
-import os, json
-from datetime import datetime
-def _ts(): return datetime.utcnow().strftime("%Y%m%d-%H%M%S")
-def save_signatures(namespace, signatures, out_dir="out/signatures"):
-    os.makedirs(out_dir, exist_ok=True)
-    payload={"namespace":namespace,"signatures":signatures}
-    open(os.path.join(out_dir,"latest.json"),"w",encoding="utf-8").write(json.dumps(payload,indent=2))
-    snap=os.path.join(out_dir,f"{_ts()}-{namespace}.json")
-    open(snap,"w",encoding="utf-8").write(json.dumps(payload,indent=2))
-    return snap
-def load_latest(out_dir="out/signatures"):
-    p=os.path.join(out_dir,"latest.json")
-    if not os.path.exists(p): return {"namespace":"","signatures":[]}
-    try: return json.load(open(p,"r",encoding="utf-8"))
-    except Exception: return {"namespace":"","signatures":[]}
+import os, json, time, calendar
+from contextlib import contextmanager
+
+# Layout (per namespace, under out_dir/<namespace>/):
+#   YYYYMMDD.jsonl         append-only raw runs: {"ts": epoch, "signatures": [...]}
+#   hourly/YYYYMMDD.jsonl  compacted hourly rollups: {"ts", "runs", "signatures"}
+#   latest.json            last run, replaced atomically
+# Day segments act as the time index: a 24 h query reads at most two files.
+OUT_DIR = "out/signatures"
+RAW_DAYS = int(os.getenv("HISTORY_RAW_DAYS", "2"))        # keep per-run detail this long
+RETENTION_DAYS = int(os.getenv("HISTORY_RETENTION_DAYS", "30"))
+ROLLUP_TOP = 50                                            # signatures kept per hourly bucket
+DAY = 86400
+
+def _day(ts): return time.strftime("%Y%m%d", time.gmtime(ts))
+def _utc(day): return calendar.timegm(time.strptime(day, "%Y%m%d"))
+
+def _ns_dir(namespace, out_dir): return os.path.join(out_dir, namespace or "_")
+
+@contextmanager
+def _locked(d):
+    os.makedirs(d, exist_ok=True)
+    f = open(os.path.join(d, ".lock"), "a+")
+    try:
+        f.seek(0)
+        if os.name == "nt":
+            import msvcrt; msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl; fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+    finally:
+        if os.name == "nt":
+            import msvcrt; f.seek(0); msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        f.close()  # closing releases the flock on POSIX
+
+def _write_atomic(path, text):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f: f.write(text)
+    os.replace(tmp, path)
+
+def _segments(d):
+    try: return sorted(n[:-6] for n in os.listdir(d) if n.endswith(".jsonl"))
+    except OSError: return []
+
+def _read(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try: yield json.loads(line)
+                except ValueError: continue  # torn last line from a crashed writer
+    except OSError:
+        return
+
+def save_signatures(namespace, signatures, out_dir=OUT_DIR, ts=None):
+    ts = time.time() if ts is None else ts
+    d = _ns_dir(namespace, out_dir)
+    payload = {"namespace": namespace, "ts": ts, "signatures": signatures}
+    with _locked(d):
+        seg = os.path.join(d, f"{_day(ts)}.jsonl")
+        new_day = not os.path.exists(seg)
+        with open(seg, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"ts": ts, "signatures": signatures}, separators=(",", ":")) + "\n")
+        _write_atomic(os.path.join(d, "latest.json"), json.dumps(payload))
+        if new_day:
+            _compact(d, ts)
+    return seg
+
+def load_latest(out_dir=OUT_DIR, namespace=None):
+    # namespace=None reads the pre-namespaced global file, if any
+    p = os.path.join(_ns_dir(namespace, out_dir), "latest.json") if namespace else os.path.join(out_dir, "latest.json")
+    if not os.path.exists(p): return {"namespace": namespace or "", "signatures": []}
+    try: return json.load(open(p, "r", encoding="utf-8"))
+    except Exception: return {"namespace": namespace or "", "signatures": []}
+
+def runs(namespace, since=None, until=None, out_dir=OUT_DIR):
+    """Runs for a namespace in [since, until], oldest first. Raw segments give
+    per-run detail; older spans come from hourly rollups."""
+    d = _ns_dir(namespace, out_dir)
+    until = time.time() if until is None else until
+    since = 0 if since is None else since
+    first, last = _day(since), _day(until)
+    raw = [s for s in _segments(d) if first <= s <= last]
+    raw_from = raw[0] if raw else "99999999"
+    for s in _segments(os.path.join(d, "hourly")):
+        if first <= s <= last and s < raw_from:
+            for r in _read(os.path.join(d, "hourly", f"{s}.jsonl")):
+                if since <= r.get("ts", 0) <= until: yield r
+    for s in raw:
+        for r in _read(os.path.join(d, f"{s}.jsonl")):
+            if since <= r.get("ts", 0) <= until: yield r
+
+def series(namespace, message, hours=24, out_dir=OUT_DIR):
+    """[(ts, count)] for one signature (matched by message or id) over the last `hours`."""
+    since = time.time() - hours * 3600
+    out = []
+    for r in runs(namespace, since, out_dir=out_dir):
+        n = sum(s.get("count", 0) for s in r.get("signatures", [])
+                if s.get("message") == message or s.get("id") == message)
+        out.append((r["ts"], n / max(r.get("runs", 1), 1)))
+    return out
+
+def baseline(namespace, last_runs=10, out_dir=OUT_DIR):
+    """Mean count per signature over the last N raw runs, newest segments first."""
+    d = _ns_dir(namespace, out_dir)
+    picked = []
+    for s in reversed(_segments(d)):
+        picked = list(_read(os.path.join(d, f"{s}.jsonl"))) + picked
+        if len(picked) >= last_runs: break
+    picked = picked[-last_runs:]
+    totals = {}
+    for r in picked:
+        for s in r.get("signatures", []):
+            totals[s["message"]] = totals.get(s["message"], 0) + s.get("count", 0)
+    n = len(picked) or 1
+    ranked = sorted(totals.items(), key=lambda x: x[1], reverse=True)
+    return [{"message": m, "count": c / n} for m, c in ranked]
+
+def _rollup(records):
+    buckets = {}
+    for r in records:
+        hour = int(r.get("ts", 0)) // 3600 * 3600
+        b = buckets.setdefault(hour, {"runs": 0, "counts": {}, "ids": {}})
+        b["runs"] += r.get("runs", 1)
+        for s in r.get("signatures", []):
+            m = s["message"]
+            b["counts"][m] = b["counts"].get(m, 0) + s.get("count", 0)
+            if s.get("id"): b["ids"][m] = s["id"]
+    for hour in sorted(buckets):
+        b = buckets[hour]
+        top = sorted(b["counts"].items(), key=lambda x: x[1], reverse=True)[:ROLLUP_TOP]
+        sigs = [dict({"message": m, "count": c}, **({"id": b["ids"][m]} if m in b["ids"] else {})) for m, c in top]
+        yield {"ts": hour, "runs": b["runs"], "signatures": sigs}
+
+def _compact(d, now):
+    # raw days past RAW_DAYS -> hourly rollups; rollups past RETENTION_DAYS -> gone
+    hd = os.path.join(d, "hourly")
+    for s in _segments(d):
+        if _utc(s) + DAY <= now - RAW_DAYS * DAY:
+            os.makedirs(hd, exist_ok=True)
+            lines = [json.dumps(r, separators=(",", ":")) for r in _rollup(_read(os.path.join(d, f"{s}.jsonl")))]
+            _write_atomic(os.path.join(hd, f"{s}.jsonl"), "".join(l + "\n" for l in lines))
+            os.remove(os.path.join(d, f"{s}.jsonl"))
+    for s in _segments(hd):
+        if _utc(s) + DAY <= now - RETENTION_DAYS * DAY:
+            os.remove(os.path.join(hd, f"{s}.jsonl"))
+
+def compact(namespace, out_dir=OUT_DIR, now=None):
+    d = _ns_dir(namespace, out_dir)
+    with _locked(d):
+        _compact(d, time.time() if now is None else now)
+
 def diff_signatures(prev, curr):
+    # sketch counts are upper bounds; a signature only counts as rising when
+    # its lower bound (count - err) is above the previous count
     p={s["message"]:s["count"] for s in prev}; c={s["message"]:s["count"] for s in curr}
+    lo={s["message"]:s["count"]-s.get("err",0) for s in curr}
     new=[{"message":m,"count":c[m]} for m in c.keys() if m not in p][:5]
-    rising=[{"message":m,"prev":p[m],"now":c[m]} for m in c.keys() if m in p and c[m]>p[m]]
+    rising=[{"message":m,"prev":p[m],"now":c[m]} for m in c.keys() if m in p and lo[m]>p[m]]
     rising.sort(key=lambda x:(x["now"]-x["prev"]), reverse=True)
     return {"new":new[:5],"rising":rising[:5]}
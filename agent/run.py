@@ -1,10 +1,11 @@
-import os
+import os, time
 from datetime import datetime
-from copilot.tools.prom import instant as promq
-from copilot.tools.k8s import pods, events, worst_pod, logs
-from copilot.tools.loki import top_errors_by_pod, sample_error_signatures
+from copilot.tools import informer
+from copilot.tools.k8s import worst_pod, logs
+from agent.collect import Collector, collect
 from agent.history import load_latest, save_signatures, diff_signatures
 from agent.runbooks import suggest as suggest_runbooks
+from copilot.tools.trace import span, trace, summary
 
 SLO_TARGET = float(os.getenv("SLO_TARGET", "0.995"))
 PERIOD_MIN = 43200  # 30d
@@ -13,49 +14,55 @@ def burn_rate(err_rate, win, slo=SLO_TARGET, period=PERIOD_MIN):
     allowed = (1.0 - slo) * (win / period)
     return (err_rate / allowed) if allowed > 0 else 0.0
 
-def gather(namespace="default", window_min=5):
-    # Prometheus (error % + burn)
-    err_q = f'(sum(rate(apiserver_request_total{{code=~"5.."}}[{window_min}m])) or on() vector(0))'
-    tot_q = f'clamp_min(sum(rate(apiserver_request_total[{window_min}m])), 1e-12)'
-    e = promq(err_q); t = promq(tot_q)
-    err_rate = (e / t) if t > 0 else 0.0
-    br = burn_rate(err_rate, window_min)
-
-    # K8s (crash/backoff)
-    pjson = pods(namespace); crashies = []
-    for it in pjson.get("items", []):
-        name = it.get("metadata", {}).get("name", "")
-        st = it.get("status", {})
-        rest = sum(int(c.get("restartCount", 0)) for c in st.get("containerStatuses", []) or [])
-        reasons = [(c.get("state", {}).get("waiting", {}) or {}).get("reason", "")
-                   for c in st.get("containerStatuses", []) or []]
-        if "CrashLoopBackOff" in ",".join(reasons) or rest >= 5:
-            crashies.append({"pod": name, "restarts": rest, "reasons": [r for r in reasons if r]})
-
-    # K8s Warning events
-    ev = events(namespace); reasons = {}
+def crashy_pods(table):
+    return [{"pod": table.name[i], "restarts": table.restarts[i], "reasons": table.reasons(i)}
+            for i in table.crashy()]
+
+def warning_reasons(ev):
+    reasons = {}
     for it in ev.get("items", []):
         if it.get("type", "") != "Warning":
             continue
         r = it.get("reason", "Unknown")
         reasons[r] = reasons.get(r, 0) + int(it.get("count", 1))
-    top_warn = sorted(reasons.items(), key=lambda x: x[1], reverse=True)[:5]
+    return sorted(reasons.items(), key=lambda x: x[1], reverse=True)[:5]
 
-    # Loki (spikes + signatures)
-    by_pod = top_errors_by_pod(namespace, window_min)
-    sigs = sample_error_signatures(namespace, window_min, limit=10)
+def _burn(snap, window_min):
+    e, t = snap["err"], snap["tot"]
+    err_rate = (e / t) if t > 0 else 0.0
+    return err_rate, burn_rate(err_rate, window_min)
 
-    # History (diff new/rising)
-    prev = load_latest().get("signatures", [])
+def _signatures(namespace, sigs):
+    # History (diff new/rising) + runbook suggestions
+    prev = load_latest(namespace=namespace).get("signatures", [])
     delta = diff_signatures(prev, sigs)
     save_signatures(namespace, sigs)
-
-    # Runbook suggestions
-    rb_suggestions = suggest_runbooks(sigs, index_path="runbooks/index.yaml")
-
-    # Worst pod tail
-    worst = worst_pod(namespace)
-    log_tail = logs(worst, namespace, tail=120) if worst else ""
+    return delta, suggest_runbooks(sigs, index_path="runbooks/index.yaml")
+
+def _worst(namespace, pjson, tail_logs=True):
+    worst = worst_pod(namespace, pjson)
+    log_tail = logs(worst, namespace, tail=120) if worst and tail_logs else ""
+    return worst, log_tail
+
+def evaluate(namespace, window_min, snap, memo=None, tail_logs=True):
+    """Derive report sections from a collector snapshot. With a memo dict
+    (watch mode), a section is recomputed only when the versions of the
+    sources it reads have changed since the last call. tail_logs=False skips
+    the kubectl logs call for the worst pod."""
+    memo = {} if memo is None else memo
+    def section(name, deps, fn):
+        key = tuple(snap["versions"][d] for d in deps)
+        if name not in memo or memo[name][0] != key:
+            with span(f"section:{name}"):
+                memo[name] = (key, fn())
+        return memo[name][1]
+
+    err_rate, br = section("burn", ("err", "tot"), lambda: _burn(snap, window_min))
+    crashies = section("crash", ("pods",), lambda: crashy_pods(snap["pods"]))
+    top_warn = section("warn", ("events",), lambda: warning_reasons(snap["events"]))
+    delta, rb_suggestions = section("sigs", ("sigs",), lambda: _signatures(namespace, snap["sigs"]))
+    # the log tail changes while the pod table doesn't; "logs" ticks on its own TTL
+    worst, log_tail = section("worst", ("pods", "logs"), lambda: _worst(namespace, snap["pods"], tail_logs))
 
     return {
         "ts": datetime.utcnow().isoformat() + "Z",
@@ -66,14 +73,27 @@ def gather(namespace="default", window_min=5):
         "burn_rate": br,
         "crashy_pods": crashies,
         "top_warning_events": top_warn,
-        "loki_error_rate_by_pod": by_pod,
-        "loki_top_error_signatures": sigs,
+        "loki_error_rate_by_pod": snap["by_pod"],
+        "loki_top_error_signatures": snap["sigs"],
+        # newest Loki timestamp read when the page cap cut the window short
+        "loki_truncated_at": snap["sigs"].last_ts if getattr(snap["sigs"], "truncated", False) else None,
         "delta": delta,
         "runbooks": rb_suggestions,
         "worst_pod": worst,
-        "worst_logs_tail": log_tail[-2000:] if log_tail else ""
+        "worst_logs_tail": log_tail[-2000:] if log_tail else "",
+        "missing_sources": snap["missing"]
     }
 
+def gather(namespace="default", window_min=5):
+    # One parallel fetch of Prometheus, pods, events and Loki; every section
+    # works off this snapshot. The report carries the run's span tree.
+    with trace("agent.gather", namespace=namespace, window_min=window_min) as t:
+        with span("collect"):
+            snap = collect(namespace, window_min)
+        r = evaluate(namespace, window_min, snap)
+    r["spans"] = t.to_dict()
+    return r
+
 def classify(br):
     if br < 1: return "OK"
     if br < 2: return "Burning"
@@ -85,6 +105,8 @@ def render(r):
     tl = f"{lvl} — burn={r['burn_rate']:.2f}x over {win}m, err_rate={r['error_rate']:.3%}, ns={ns}"
 
     find = [f"SLO burn: {r['burn_rate']:.2f}x → {lvl}"]
+    if r.get("missing_sources"):
+        find.append("Sources unavailable (failed or past deadline): " + ", ".join(r["missing_sources"]))
     for c in r["crashy_pods"][:5]:
         find.append(f"Crash/backoff: {c['pod']} restarts={c['restarts']} reasons={','.join(c['reasons']) or '-'}")
 
@@ -101,6 +123,9 @@ def render(r):
         sigs = "; ".join([f"“{s['message'][:70]}”×{s['count']}"
                           for s in r["loki_top_error_signatures"][:5]])
         find.append(f"Top error signatures: {sigs}")
+    if r.get("loki_truncated_at"):
+        at = datetime.utcfromtimestamp(r["loki_truncated_at"] / 1e9).strftime("%H:%M:%SZ")
+        find.append(f"Error signatures only cover logs up to {at}: Loki page cap (LOKI_MAX_PAGES) reached")
 
     if r["delta"].get("new"):
         find.append("New signatures: " +
@@ -147,21 +172,68 @@ def render(r):
         md.append("```")
 
     md.append("\n## Stakeholder update (draft)\n" + status)
+    if r.get("spans"):
+        md.append("\n## Timing")
+        md += summary(r["spans"])
     return "\n".join(md)
 
+def _write_atomic(path, text):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
 def main(namespace="default", window_min=5, outfile="out/agent-report.md"):
     os.makedirs(os.path.dirname(outfile), exist_ok=True)
     text = render(gather(namespace, window_min))
-    with open(outfile, "w", encoding="utf-8") as f:
-        f.write(text)
+    _write_atomic(outfile, text)
     print(text)
     print(f"\n[Saved] {outfile}")
 
+def watch(namespace="default", window_min=5, outfile="out/agent-report.md", interval=60):
+    """Stay resident: refetch sources as their TTLs expire, re-derive only the
+    sections whose inputs changed, and rewrite the report only when its
+    content (ignoring the timestamped title) differs."""
+    os.makedirs(os.path.dirname(outfile), exist_ok=True)
+    informer.start(("pods", "events"), namespace, wait_s=5)
+    col, memo, last = Collector(namespace, window_min), {}, None
+    try:
+        with open(outfile, "r", encoding="utf-8") as f:
+            last = f.read().split("\n", 1)[-1]
+    except OSError:
+        pass
+    try:
+        while True:
+            text = render(evaluate(namespace, window_min, col.refresh(), memo))
+            body = text.split("\n", 1)[-1]
+            if body != last:
+                _write_atomic(outfile, text); last = body
+                print(f"[Updated] {outfile} ({datetime.utcnow().isoformat()}Z)")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        informer.stop_all()
+
 if __name__ == "__main__":
     import argparse
     ap = argparse.ArgumentParser()
     ap.add_argument("--namespace", default="default")
     ap.add_argument("--window-minutes", type=int, default=5)
     ap.add_argument("--output", default="out/agent-report.md")
+    ap.add_argument("--watch", action="store_true")
+    ap.add_argument("--interval", type=int, default=60)
+    ap.add_argument("--all-namespaces", "-A", action="store_true")
+    ap.add_argument("--selector", "-l", default=None)
+    ap.add_argument("--fleet-dir", default="out/fleet")
+    ap.add_argument("--concurrency", type=int, default=8)
     a = ap.parse_args()
-    main(namespace=a.namespace, window_min=a.window_minutes, outfile=a.output)
+    if (a.all_namespaces or a.selector) and a.watch:
+        ap.error("--watch works on a single namespace")
+    if a.all_namespaces or a.selector:
+        from agent.fleet import main as fleet_main
+        fleet_main(window_min=a.window_minutes, selector=a.selector, outdir=a.fleet_dir, concurrency=a.concurrency)
+    elif a.watch:
+        watch(namespace=a.namespace, window_min=a.window_minutes, outfile=a.output, interval=a.interval)
+    else:
+        main(namespace=a.namespace, window_min=a.window_minutes, outfile=a.output)
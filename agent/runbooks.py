@@ -1,16 +1,84 @@
-import re, yaml
+import os, re, yaml
+from copilot.tools.trace import span
+try:
+    from re import _parser as _sre  # 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse as _sre
+
+_CACHE = {}  # index path -> (mtime_ns, Matcher)
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 def _load_index(path="runbooks/index.yaml"):
-    try: return yaml.safe_load(open(path,"r",encoding="utf-8")) or {}
+    try: return yaml.load(open(path,"r",encoding="utf-8"), Loader=_Loader) or {}
     except Exception: return {}
+
+def _required_literal(pat):
+    """Longest literal run every match of `pat` must contain (lowercased), or ''."""
+    try: parsed = _sre.parse(pat, re.I)
+    except Exception: return ""
+    best, cur = "", []
+    for op, av in parsed:
+        if op is _sre.LITERAL:
+            cur.append(chr(av)); continue
+        if len("".join(cur)) > len(best): best = "".join(cur)
+        cur = []
+    if len("".join(cur)) > len(best): best = "".join(cur)
+    return best.lower()
+
+class Matcher:
+    """All rules of one index.yaml compiled once.
+
+    Each rule's required literal is indexed by its first trigram; a signature
+    is turned into its trigram set once, which selects the few candidate
+    rules whose literal can occur in it, and only those are confirmed with
+    the rule regex. Rules without a usable literal are always confirmed."""
+
+    def __init__(self, rules):
+        self.rules = []   # (runbook, summary, regex | None, literal)
+        self.by_gram = {}
+        self.always = []
+        for r in rules:
+            pat=r.get("pattern",""); rb=r.get("runbook",""); summ=r.get("summary","")
+            if not pat or not rb: continue
+            try: rx=re.compile(pat, re.I); lit=_required_literal(pat)
+            except re.error: rx=None; lit=pat.lower()
+            i = len(self.rules)
+            self.rules.append((rb, summ, rx, lit))
+            if len(lit) >= 3: self.by_gram.setdefault(lit[:3], []).append(i)
+            else: self.always.append(i)
+
+    def match(self, msg):
+        """Indices of rules matching one lowercased message."""
+        grams = {msg[i:i+3] for i in range(len(msg) - 2)}
+        cand = list(self.always)
+        for g in grams & self.by_gram.keys():
+            cand.extend(self.by_gram[g])
+        hits = set()
+        for i in cand:
+            _, _, rx, lit = self.rules[i]
+            if lit and lit not in msg: continue
+            if rx is None or rx.search(msg): hits.add(i)
+        return hits
+
+def matcher(path="runbooks/index.yaml"):
+    try: mtime = os.stat(path).st_mtime_ns
+    except OSError: return Matcher([])
+    hit = _CACHE.get(path)
+    if hit and hit[0] == mtime: return hit[1]
+    m = Matcher(_load_index(path).get("rules",[]) or [])
+    _CACHE[path] = (mtime, m)
+    return m
+
 def suggest(signatures, index_path="runbooks/index.yaml", limit=3):
-    idx=_load_index(index_path); rules=idx.get("rules",[]); msgs=[s["message"].lower() for s in signatures]
+    with span("runbooks.suggest", items=len(signatures)):
+        return _suggest(signatures, index_path, limit)
+
+def _suggest(signatures, index_path, limit):
+    m=matcher(index_path); hits=set()
+    for s in signatures: hits |= m.match(s["message"].lower())
     out, seen=[], set()
-    for r in rules:
-        pat=r.get("pattern",""); rb=r.get("runbook",""); summ=r.get("summary","")
-        if not pat or not rb: continue
-        try: rx=re.compile(pat, re.I)
-        except re.error: rx=None
-        if any((rx.search(m) if rx else pat.lower() in m) for m in msgs):
-            if rb not in seen: out.append({"runbook":rb,"summary":summ}); seen.add(rb)
+    for i in sorted(hits):
+        rb, summ, _, _ = m.rules[i]
+        if rb not in seen: out.append({"runbook":rb,"summary":summ}); seen.add(rb)
         if len(out)>=limit: break
     return out
@@ -1,36 +1,58 @@
 import os, json, time
 import typer
 from rich import print, box
-from rich.table import Table
 from dotenv import load_dotenv
 
-from copilot.workflows.health import health_snapshot
-from copilot.workflows.triage import triage
-from copilot.workflows.status import status_from_context
-from copilot.tools.kubectl_safe import run as kctl
+# Workflows (and their requests/yaml/openai dependencies) are imported inside
+# the commands that use them, so cheap commands like slo-burn or canary start
+# fast. See scripts/bench_startup.py for the startup budget check.
 from copilot.tools.slo import burn_rate
 from copilot.tools.canary import compare as canary_compare
-from copilot.tools.cost import heuristic as cost_heuristic
 
 app = typer.Typer(help="On-Call Copilot CLI")
 load_dotenv()
 
-def maybe_audit(name: str, payload: dict, audit: bool):
+def maybe_audit(name: str, payload: dict, audit: bool, spans=None):
     if not audit:
         return
+    if spans is not None:
+        payload = dict(payload, spans=spans.to_dict())
     ts = time.strftime("%Y%m%d-%H%M%S")
     path = os.path.join("audits", f"{ts}-{name}.json")
     os.makedirs("audits", exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2)
 
+class AuditStream:
+    """Audit JSON written while a draft streams: the opening of the "status"
+    string first, each token JSON-escaped as it arrives, then the remaining
+    fields and the closing brace. A crash mid-stream leaves the tokens so far."""
+    def __init__(self, name: str, enabled: bool):
+        self.f = None
+        if not enabled: return
+        os.makedirs("audits", exist_ok=True)
+        self.path = os.path.join("audits", f"{time.strftime('%Y%m%d-%H%M%S')}-{name}.json")
+        self.f = open(self.path, "w", encoding="utf-8")
+        self.f.write('{\n  "status": "'); self.f.flush()
+
+    def write(self, token: str):
+        if self.f: self.f.write(json.dumps(token)[1:-1]); self.f.flush()
+
+    def close(self, **fields):
+        if not self.f: return
+        self.f.write('",\n  ' + json.dumps(fields, indent=2)[1:].lstrip())
+        self.f.close(); self.f = None
+
 @app.command()
 def health(namespace: str = typer.Option(None, help="Kubernetes namespace"),
            json_out: bool = typer.Option(False, "--json", help="Print JSON"),
            audit: bool = typer.Option(False, "--audit", help="Write JSON audit log")):
     """Cluster health snapshot: pods, nodes, events, and hints."""
-    data = health_snapshot(namespace)
-    maybe_audit("health", data, audit)
+    from copilot.workflows.health import health_snapshot
+    from copilot.tools.trace import trace
+    with trace("health", namespace=namespace or "") as t:
+        data = health_snapshot(namespace)
+    maybe_audit("health", data, audit, t)
     if json_out:
         print_json(data)
         return
@@ -50,16 +72,59 @@ def triage_cmd(pod: str = typer.Option(..., "--pod", help="Pod name"),
                namespace: str = typer.Option(None, "--namespace", help="Namespace"),
                lines: int = typer.Option(500, "--lines", help="Log tail lines"),
                json_out: bool = typer.Option(False, "--json"),
-               audit: bool = typer.Option(False, "--audit")):
+               audit: bool = typer.Option(False, "--audit"),
+               follow: bool = typer.Option(False, "--follow", "-f", help="Follow the log stream; live top errors over a sliding window"),
+               window: int = typer.Option(300, "--window", help="Sliding window in seconds for --follow"),
+               top: int = typer.Option(10, "--top", help="Templates shown in --follow mode"),
+               refresh: float = typer.Option(1.0, "--refresh", help="Seconds between --follow table refreshes")):
     """Log triage for a pod: extract top errors and relevant runbooks."""
-    data = triage(pod, namespace, lines)
-    maybe_audit("triage", data, audit)
+    if follow:
+        return follow_triage(pod, namespace, lines, window, top, refresh, json_out, audit)
+    from copilot.workflows.triage import triage
+    from copilot.tools.trace import trace
+    with trace("triage", pod=pod, namespace=namespace or "") as t:
+        data = triage(pod, namespace, lines)
+    maybe_audit("triage", data, audit, t)
     if json_out:
         print_json(data)
         return
     show_triage(data)
 
+def follow_triage(pod, namespace, lines, window, top, refresh, json_out, audit):
+    # --lines is the initial tail here; --json emits one snapshot per line
+    from copilot.workflows.triage import follow
+    snaps, last = follow(pod, namespace, lines, window, top, refresh), {}
+    try:
+        if json_out:
+            for last in snaps: typer.echo(json.dumps(last))
+        else:
+            from rich.live import Live
+            with Live(follow_table(None), refresh_per_second=4) as live:
+                for last in snaps: live.update(follow_table(last))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        snaps.close()
+    maybe_audit("triage-follow", last, audit)
+
+def follow_table(snap: dict | None):
+    from rich.table import Table
+    if snap is None:
+        return Table(title="Waiting for log lines...", box=box.SIMPLE)
+    if not snap["ok"]:
+        from rich.markup import escape
+        t = Table(title=f"Log follow failed — {snap['pod']}", box=box.SIMPLE)
+        t.add_column("Error", style="red"); t.add_row(escape(snap["error"]))
+        return t
+    state = "following" if snap["running"] else f"stream ended (exit {snap.get('exit')})"
+    t = Table(title=f"Top Errors — last {snap['window_s']}s, {snap['pod']} ({state})",
+              caption=f"{snap['lines']} lines, {snap['errors']} errors in {snap['elapsed_s']}s", box=box.SIMPLE)
+    t.add_column("Message"); t.add_column("Count", justify="right")
+    for e in snap["top_errors"]: t.add_row(e["message"], str(e["count"]))
+    return t
+
 def show_triage(data: dict):
+    from rich.table import Table
     print("[bold underline]Log Triage[/]")
     logs = data.get("logs", {})
     if logs.get("ok"):
@@ -84,17 +149,42 @@ def show_triage(data: dict):
 @app.command("status-draft")
 def status_cmd(namespace: str = typer.Option(None, "--namespace"),
                json_out: bool = typer.Option(False, "--json"),
-               audit: bool = typer.Option(False, "--audit")):
+               audit: bool = typer.Option(False, "--audit"),
+               timeout: float = typer.Option(None, "--timeout", help="Seconds to wait for the LLM before using the template (default LLM_TIMEOUT_S)"),
+               stream: bool = typer.Option(False, "--stream", help="Print tokens as they arrive; audit records ttft_ms/total_ms")):
     """Draft a concise stakeholder status message from a quick health snapshot."""
-    snap = health_snapshot(namespace)
-    context = json.dumps({
-        "pods": snap.get("pods", {}).get("text","")[:2000],
-        "events": snap.get("events", {}).get("text","")[:2000],
-        "hints": snap.get("hints", [])
-    }, indent=2)
-    msg = status_from_context(context)
-    data = {"status": msg}
-    maybe_audit("status", data, audit)
+    if stream and json_out:
+        print("[red]Error:[/] --stream prints tokens as text; drop --stream for --json"); raise typer.Exit(2)
+    from copilot.workflows.health import health_snapshot
+    from copilot.workflows.status import draft, draft_stream
+    from copilot.tools.trace import trace, span
+    with trace("status-draft", namespace=namespace or "") as t:
+        snap = health_snapshot(namespace)
+        context = json.dumps({
+            "pods": snap.get("pods", {}).get("text","")[:2000],
+            "events": snap.get("events", {}).get("text","")[:2000],
+            "hints": snap.get("hints", [])
+        }, indent=2)
+        if stream:
+            from rich.console import Console
+            console, out = Console(), AuditStream("status", audit)
+            console.print("[bold underline]Draft Status Update[/]")
+            def on_token(tok):
+                out.write(tok); console.print(tok, end="", markup=False, highlight=False, soft_wrap=True)
+            with span("llm.stream") as s:
+                data = draft_stream(context, on_token, timeout)
+                s.set(source=data["source"], ttft_ms=data["ttft_ms"], bytes=len(data["status"]))
+            console.print()
+        else:
+            with span("llm") as s:
+                data = draft(context, timeout)
+                s.set(source=data["source"], bytes=len(data["status"]))
+    if stream:
+        out.close(**{k: v for k, v in data.items() if k != "status"}, spans=t.to_dict())
+        print(f"[dim]{data['source']} · first token {data['ttft_ms']:.0f} ms · total {data['total_ms']:.0f} ms[/]")
+        return
+    msg = data["status"]
+    maybe_audit("status", data, audit, t)
     if json_out:
         print_json(data); return
     print("[bold underline]Draft Status Update[/]")
@@ -131,6 +221,9 @@ def canary(canary_ok: int, canary_total: int, base_ok: int, base_total: int,
 def cost(namespace: str = typer.Option(None, "--namespace"),
          json_out: bool = typer.Option(False, "--json")):
     """Flag likely cost hotspots (heuristic) from 'kubectl get pods'."""
+    from rich.table import Table
+    from copilot.tools.kubectl_safe import run as kctl
+    from copilot.tools.cost import heuristic as cost_heuristic
     pods = kctl("get","pods",namespace=namespace)
     suspects = []
     if pods.get("ok") and pods.get("text"):
@@ -155,6 +248,7 @@ from rich import print
 @app.command("health-compact")
 def health_compact(namespace: str = typer.Option(None, "--namespace")):
     """Compact health view: PODS + Warnings summary + Latest warnings + Next checks."""
+    from copilot.workflows.health import health_snapshot
     data = health_snapshot(namespace)
     print("[bold underline]Health (compact)[/]")
     pods = data.get("pods", {})
@@ -180,7 +274,6 @@ def health_compact(namespace: str = typer.Option(None, "--namespace")):
 # --- end compact health ---
 # --- SLO multi-window command (5/30/60m) ---
 from copilot.tools.slo import multi_window
-from rich.table import Table
 from rich import print
 
 @app.command("slo-multi")
@@ -191,6 +284,7 @@ def slo_multi(
     slo_target: float = typer.Option(0.995, help="Target availability"),
     period_minutes: int = typer.Option(43200, help="SLO period (minutes)")
 ):
+    from rich.table import Table
     data = multi_window({5: e5, 30: e30, 60: e60}, slo_target, period_minutes)
     t = Table(title="SLO Burn (multi-window)")
     t.add_column("Window"); t.add_column("Err rate"); t.add_column("Allowed"); t.add_column("Burn rate"); t.add_column("Level")
@@ -204,8 +298,35 @@ def slo_multi(
     print(f"[bold]Worst:[/] {worst.get('burn_rate',0):0.2f}x at {worst.get('window_minutes')}m ? {worst.get('recommendation')}")
 # --- end SLO multi-window ---
 
+@app.command("slo-alerts", help="Multi-window, multi-burn-rate alerts for many SLOs from Prometheus range queries.")
+def slo_alerts(
+    err: str = typer.Option(..., help="PromQL error rate per SLO, e.g. sum by (service)(rate(http_requests_total{code=~\"5..\"}[1m]))"),
+    tot: str = typer.Option(..., help="PromQL total rate with the same labels, e.g. sum by (service)(rate(http_requests_total[1m]))"),
+    hours: float = typer.Option(24.0, help="How far back to evaluate (hours)"),
+    step: int = typer.Option(60, help="Query step (seconds)"),
+    slo_target: float = typer.Option(0.995, help="Target availability"),
+    url: str = typer.Option("http://localhost:9090", help="Prometheus base URL"),
+    json_out: bool = typer.Option(False, "--json", help="Print JSON")
+):
+    from copilot.tools.slo_series import alerts
+    data = alerts(err, tot, hours, step, slo_target, base_url=url)
+    if json_out:
+        print(json.dumps(data, indent=2)); return
+    from rich.table import Table
+    t = Table(title=f"SLO burn alerts (last {hours:g}h, target {slo_target})")
+    t.add_column("Series"); t.add_column("Firing"); t.add_column("Windows"); t.add_column("Burn (long/short)")
+    t.add_column("Max burn"); t.add_column("Fired (min)")
+    for r in data["series"]:
+        for i, p in enumerate(r["pairs"]):
+            burn = f"{p['burn_long'] or 0:.2f}x / {p['burn_short'] or 0:.2f}x"
+            state = f"[bold red]{p['severity']}[/]" if p["firing_now"] else "-"
+            t.add_row(r["series"] if i == 0 else "", state, f"{p['windows']} @ {p['factor']:g}x", burn,
+                      f"{p['max_burn'] or 0:.2f}x", f"{p['firing_minutes']:g}")
+    print(t)
+    paging = [r["series"] for r in data["series"] if "page" in r["firing"]]
+    print(f"[bold]Paging now:[/] {', '.join(paging) if paging else 'none'}")
+
 from copilot.tools.canary import gate as canary_gate_eval, load_policy
-from rich.table import Table
 from rich import print
 import typer
 
@@ -226,6 +347,7 @@ def canary_gate(
     r = canary_gate_eval(co, ct, bo, bt, cp95, bp95, pol, cp99, bp99)
     if json_out:
         import json as _json; print(_json.dumps(r, indent=2)); return
+    from rich.table import Table
     t = Table(title="Canary Gate")
     t.add_column("Metric"); t.add_column("Canary"); t.add_column("Baseline"); t.add_column("Delta/Regress")
     sr_c = f"{r['canary_success']*100:.2f}%" ; sr_b = f"{r['base_success']*100:.2f}%"
@@ -243,14 +365,70 @@ def canary_gate(
             for s in r["reasons"]:
                 print(f"- {s}")
 
-from copilot.workflows.cost import scan as cost_scan
-from rich.table import Table
+@app.command("canary-batch", help="Gate many canary records (JSONL file or '-' for stdin) in one pass; JSONL decisions out.")
+def canary_batch(
+    input: str = typer.Argument("-", help="JSONL canary records, one per service ('-' = stdin)"),
+    policy: str = typer.Option("canary_policy.json", help="Policy JSON path (per-service overrides under 'services')"),
+    output: str = typer.Option("-", "--output", "-o", help="Decision JSONL path ('-' = stdout)"),
+    fail_on_hold: bool = typer.Option(False, "--fail-on-hold", help="Exit 1 if any canary is held or invalid")
+):
+    import sys
+    from copilot.tools.canary_batch import run as batch_run
+    pol = load_policy(policy)
+    src = sys.stdin if input == "-" else open(input, "r", encoding="utf-8")
+    dst = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+    try:
+        n, held, bad = batch_run(src, pol, dst.write)
+    finally:
+        if src is not sys.stdin: src.close()
+        if dst is not sys.stdout: dst.close()
+    sys.stderr.write(f"{n} canaries gated, {held} held or invalid ({bad} malformed lines)\n")
+    if fail_on_hold and held: raise typer.Exit(1)
+
+@app.command("canary-samples", help="Canary gate from raw per-request samples (JSONL), with quantile CIs and a success z-test.")
+def canary_samples(
+    samples: list[str] = typer.Option([], "--samples", help="JSONL with an 'arm' field per record ('-' = stdin)"),
+    canary: list[str] = typer.Option([], "--canary", help="Canary-only samples file"),
+    base: list[str] = typer.Option([], "--base", help="Baseline-only samples file"),
+    policy: str = typer.Option("canary_policy.json", help="Policy JSON path"),
+    confidence: float = typer.Option(0.95, help="Confidence level for quantile intervals"),
+    alpha: float = typer.Option(0.01, help="Histogram relative accuracy"),
+    json_out: bool = typer.Option(False, "--json", help="Print JSON")
+):
+    from copilot.tools.canary_samples import run as canary_run
+    if not (samples or canary or base):
+        print("[red]Give --samples, or --canary and --base.[/]"); raise typer.Exit(2)
+    r = canary_run(samples, canary, base, load_policy(policy), confidence, alpha)
+    if json_out:
+        import json as _json; print(_json.dumps(r, indent=2)); return
+    if "error" in r:
+        print(f"[red]Error:[/] {r['error']} (canary {r['arms']['canary']['total']}, base {r['arms']['base']['total']} samples)"); return
+    from rich.table import Table
+    a, ts = r["arms"], r["tests"]
+    t = Table(title=f"Canary Gate (raw samples, {r['confidence']:.0%} CI)")
+    t.add_column("Metric"); t.add_column("Canary"); t.add_column("Baseline"); t.add_column("Delta/Regress"); t.add_column("Significant")
+    ms = lambda q: "-" if q["value"] is None else f"{q['value']:.0f} [{q['ci_low']:.0f}, {q['ci_high']:.0f}]"
+    t.add_row("Samples", f"{a['canary']['total']:,}", f"{a['base']['total']:,}", "", "")
+    t.add_row("Success rate", f"{r['canary_success']*100:.2f}%", f"{r['base_success']*100:.2f}%",
+              f"{r['success_delta_pct']:.2f}%", f"p={ts['success']['p_lower']:.3g} (canary lower)")
+    for p in ("p50", "p95", "p99"):
+        reg = r.get(f"{p}_regress_pct")
+        sig = ts[p]["canary_slower"]
+        t.add_row(f"{p} (ms)", ms(a["canary"][p]), ms(a["base"][p]), "" if reg is None else f"{reg:.2f}%",
+                  "-" if sig is None else ("slower" if sig else "no"))
+    print(t)
+    print("[bold green]Decision: Continue[/]" if r["decision"] == "Continue" else "[bold red]Decision: Hold canary[/]")
+    for s in r["reasons"]:
+        print(f"- {s}")
+
 from rich import print
 
 @app.command("cost", help="Flag likely cost hotspots from pod specs and status (heuristics only).")
 def cost_cmd(namespace: str = typer.Option(None, "--namespace"),
              skew_threshold: float = typer.Option(4.0, help="limits:requests ratio to flag"),
              restart_threshold: int = typer.Option(5, help="restarts to flag")):
+    from rich.table import Table
+    from copilot.workflows.cost import scan as cost_scan
     res = cost_scan(namespace, skew_threshold, restart_threshold)
     if not res.get("ok"):
         print(f"[red]Error:[/] {res.get('error')}"); return
@@ -264,7 +442,6 @@ def cost_cmd(namespace: str = typer.Option(None, "--namespace"),
         print(t)
 
 from copilot.tools.slo import burn_rate
-from copilot.tools.prom import instant as promq
 from rich import print
 import typer
 
@@ -275,97 +452,54 @@ def slo_prom(
     window_minutes: int = typer.Option(5, help="Short window in minutes (match your PromQL range)"),
     slo_target: float = typer.Option(0.995, help="Target availability"),
     url: str = typer.Option("http://localhost:9090", help="Prometheus base URL"),
+    window_mean: bool = typer.Option(False, "--window-mean",
+                                     help="Treat --err/--tot as 1m rates and average them over the window through the local range cache"),
 ):
-    e = promq(err, url); t = promq(tot, url)
+    if window_mean:
+        import re
+        from copilot.tools.prom import window_mean as wm
+        for q in (err, tot):
+            if re.search(r"\[(?!1m\])[^\]]*\]", q):
+                raise typer.BadParameter(f"--window-mean needs [1m] range selectors: {q}")
+        e = wm(err, window_minutes, base_url=url); t = wm(tot, window_minutes, base_url=url)
+    else:
+        from copilot.tools.prom import instant as promq
+        e = promq(err, url); t = promq(tot, url)
     error_rate = (e / t) if t > 0 else 0.0
     r = burn_rate(error_rate, slo_target, window_minutes)
     print(f"[bold]Error rate:[/] {error_rate:.4%}  (e={e:.4f}, t={t:.4f})")
     print(f"[bold]Burn rate:[/] {r['burn_rate']:.2f}x ? [bold]{r['level']}[/]")
     print(f"Recommendation: {r['recommendation']}")
 
-from agent.run import main as agent_main
+@app.command("prom-cache", help="Show (or clear) the local Prometheus range-query cache.")
+def prom_cache(clear: bool = typer.Option(False, "--clear", help="Drop all cached chunks and counters")):
+    from copilot.tools import promcache
+    if clear:
+        promcache.clear(); print("[green]Cache cleared.[/]"); return
+    print(json.dumps(promcache.stats(), indent=2))
 
-@app.command("agent-run", help="Run the agent once and emit a triage report")
+@app.command("agent-run", help="Run the agent once (or keep watching) and emit a triage report")
 def agent_run(
     namespace: str = typer.Option("default", help="Kubernetes namespace"),
     window_minutes: int = typer.Option(5, help="Window for error rate/burn (minutes)"),
-    output: str = typer.Option("out/agent-report.md", help="Output Markdown file")
+    output: str = typer.Option("out/agent-report.md", help="Output Markdown file"),
+    watch: bool = typer.Option(False, "--watch", help="Stay running and update the report as inputs change"),
+    interval: int = typer.Option(60, "--interval", help="Seconds between refreshes in --watch mode"),
+    all_namespaces: bool = typer.Option(False, "--all-namespaces", "-A", help="Sweep every namespace from one cluster-wide fetch"),
+    selector: str = typer.Option(None, "--selector", "-l", help="Sweep namespaces matching this label selector"),
+    fleet_dir: str = typer.Option("out/fleet", "--fleet-dir", help="Output directory for fleet summary and reports"),
+    concurrency: int = typer.Option(8, "--concurrency", help="Namespaces evaluated in parallel in a fleet sweep")
 ):
-    agent_main(namespace=namespace, window_min=window_minutes, outfile=output)
+    if all_namespaces or selector:
+        if watch:
+            print("[red]Error:[/] --watch works on a single namespace"); raise typer.Exit(2)
+        from agent.fleet import main as fleet_main
+        fleet_main(window_min=window_minutes, selector=selector, outdir=fleet_dir, concurrency=concurrency)
+        return
+    from agent.run import main as agent_main, watch as agent_watch
+    if watch:
+        agent_watch(namespace=namespace, window_min=window_minutes, outfile=output, interval=interval)
+    else:
+        agent_main(namespace=namespace, window_min=window_minutes, outfile=output)
 if __name__ == "__main__":
     app()
-from rich import print
-
-@app.command("health-compact")
-def health_compact(namespace: str = typer.Option(None, "--namespace")):
-    """Compact health view: PODS + Warnings summary + Latest warnings + Next checks."""
-    data = health_snapshot(namespace)
-    print("[bold underline]Health (compact)[/]")
-    pods = data.get("pods", {})
-    print(f"\n[bold]PODS[/] (cmd: {pods.get('cmd','-')}, {pods.get('ms','?')} ms)")
-    text = (pods.get("text") or pods.get("error") or "").strip()
-    print(text[:1200] + ("..." if len(text) > 1200 else ""))
-
-    ws = data.get("warning_summary", {}) or {}
-    counts = ws.get("count_by_reason") or {}
-    if counts:
-        print("\n[bold]Warnings summary (by reason):[/]")
-        for reason, cnt in sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:6]:
-            print(f"- {reason}: {cnt}")
-
-    latest = (ws.get("latest") or [])[:5]
-    if latest:
-        print("\n[bold]Latest Warning events:[/]")
-        for ev in latest:
-            print(f"- [{ev.get('reason')}] {ev.get('object')}: {ev.get('message')}")
-
-    print("\n[bold]Next checks:[/]", ", ".join(data.get("hints", [])) or "None")
-from rich import print
-
-@app.command("health-compact")
-def health_compact(namespace: str = typer.Option(None, "--namespace")):
-    """Compact health view: PODS + Warnings summary + Latest warnings + Next checks."""
-    data = health_snapshot(namespace)
-    print("[bold underline]Health (compact)[/]")
-    pods = data.get("pods", {})
-    print(f"\n[bold]PODS[/] (cmd: {pods.get('cmd','-')}, {pods.get('ms','?')} ms)")
-    text = (pods.get("text") or pods.get("error") or "").strip()
-    print(text[:1200] + ("..." if len(text) > 1200 else ""))
-
-    ws = data.get("warning_summary", {}) or {}
-    counts = ws.get("count_by_reason") or {}
-    if counts:
-        print("\n[bold]Warnings summary (by reason):[/]")
-        for reason, cnt in sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:6]:
-            print(f"- {reason}: {cnt}")
-
-    latest = (ws.get("latest") or [])[:5]
-    if latest:
-        print("\n[bold]Latest Warning events:[/]")
-        for ev in latest:
-            print(f"- [{ev.get('reason')}] {ev.get('object')}: {ev.get('message')}")
-
-    print("\n[bold]Next checks:[/]", ", ".join(data.get("hints", [])) or "None")
-from copilot.tools.slo import multi_window
-from rich.table import Table
-from rich import print
-
-@app.command("slo-multi")
-def slo_multi(
-    e5: float = typer.Option(..., help="Error rate over last 5m (0..1)"),
-    e30: float = typer.Option(..., help="Error rate over last 30m (0..1)"),
-    e60: float = typer.Option(..., help="Error rate over last 60m (0..1)"),
-    slo_target: float = typer.Option(0.995, help="Target availability"),
-    period_minutes: int = typer.Option(43200, help="SLO period (minutes)")
-):
-    data = multi_window({5: e5, 30: e30, 60: e60}, slo_target, period_minutes)
-    t = Table(title="SLO Burn (multi-window)")
-    t.add_column("Window"); t.add_column("Err rate"); t.add_column("Allowed"); t.add_column("Burn rate"); t.add_column("Level")
-    for w in [5,30,60]:
-        r = data["windows"][w]
-        t.add_row(f"{w}m", f"{r.get('error_rate'):0.4f}",
-                  f"{r.get('allowed_error_rate_window'):0.6f}",
-                  f"{r.get('burn_rate',0):0.2f}", r.get("level","-"))
-    worst = data["worst"]
-    print(t)
-    print(f"[bold]Worst:[/] {worst.get('burn_rate',0):0.2f}x at {worst.get('window_minutes')}m ? {worst.get('recommendation')}")
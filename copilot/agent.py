@@ -1,20 +1,133 @@
-import os
+import os, json, time, queue, hashlib, threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
 from typing import List, Dict
 from dotenv import load_dotenv
-from openai import OpenAI
 
 load_dotenv()
 MODEL = os.getenv("MODEL", "gpt-4o-mini")
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+TIMEOUT_S = float(os.getenv("LLM_TIMEOUT_S", "20"))        # hard deadline per completion
+RETRIES = int(os.getenv("LLM_RETRIES", "1"))
+CACHE_DIR = os.getenv("LLM_CACHE_DIR", "out/llm-cache")
+CACHE_TTL_S = float(os.getenv("LLM_CACHE_TTL_S", "600"))
+CACHE_MAX = int(os.getenv("LLM_CACHE_MAX", "256"))          # entries kept on disk
+_client = None
+_lock = threading.Lock()
+_inflight = {}   # prompt key -> Future shared by concurrent identical requests
+
+def client():
+    """OpenAI client, built on first use so importing this module stays cheap.
+    OPENAI_BASE_URL points it at any OpenAI-compatible server."""
+    global _client
+    if _client is None:
+        from openai import OpenAI
+        _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=TIMEOUT_S, max_retries=RETRIES)
+    return _client
+
+def prompt_key(model: str, messages: List[Dict[str, str]], temperature: float) -> str:
+    body = json.dumps({"model": model, "messages": messages, "temperature": temperature}, sort_keys=True)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+def cache_get(key: str):
+    path = os.path.join(CACHE_DIR, f"{key}.json")
+    try:
+        if time.time() - os.stat(path).st_mtime > CACHE_TTL_S: return None
+        with open(path, "r", encoding="utf-8") as f: return json.load(f)["text"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+def cache_put(key: str, text: str):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(CACHE_DIR, f"{key}.json")
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f: json.dump({"ts": time.time(), "model": MODEL, "text": text}, f)
+    os.replace(tmp, path)
+    # size bound: drop the oldest entries beyond CACHE_MAX (expired ones go first anyway)
+    entries = []
+    for n in os.listdir(CACHE_DIR):
+        if n.endswith(".json"):
+            try: entries.append((os.stat(os.path.join(CACHE_DIR, n)).st_mtime, n))
+            except OSError: pass
+    entries.sort()
+    for _, n in entries[:max(0, len(entries) - CACHE_MAX)]:
+        try: os.remove(os.path.join(CACHE_DIR, n))
+        except OSError: pass
+
+def _with_deadline(fn, timeout: float):
+    # run on a daemon thread so a stalled connection can't keep the CLI alive
+    fut = Future()
+    def run():
+        try: fut.set_result(fn())
+        except BaseException as e: fut.set_exception(e)
+    threading.Thread(target=run, name="llm-call", daemon=True).start()
+    return fut.result(timeout)   # concurrent.futures.TimeoutError past the deadline
 
 class Agent:
     def __init__(self, system_prompt: str = "You are a helpful SRE copilot. Prefer tools for facts."):
         self.system_prompt = system_prompt
+        self.source = None   # "cache" or "llm" for the last stream()
+
+    def complete(self, messages: List[Dict[str, str]], timeout: float | None = None,
+                 use_cache: bool = True, temperature: float = 0.2) -> tuple[str, str]:
+        """(text, source) where source is "cache" or "llm". Identical prompts
+        are answered from the content-hash cache while fresh, and concurrent
+        identical requests share one in-flight call. Raises on API errors and
+        concurrent.futures.TimeoutError after `timeout` seconds."""
+        full = [{"role": "system", "content": self.system_prompt}] + messages
+        key = prompt_key(MODEL, full, temperature)
+        if use_cache:
+            hit = cache_get(key)
+            if hit is not None: return hit, "cache"
+        with _lock:
+            fut = _inflight.get(key)
+            leader = fut is None
+            if leader: fut = _inflight[key] = Future()
+        if not leader:
+            return fut.result(timeout or TIMEOUT_S), "llm"
+        try:
+            text = _with_deadline(lambda: client().chat.completions.create(
+                model=MODEL, messages=full, temperature=temperature,
+            ).choices[0].message.content, timeout or TIMEOUT_S)
+            if use_cache: cache_put(key, text)
+            fut.set_result(text)
+            return text, "llm"
+        except BaseException as e:
+            fut.set_exception(e); raise
+        finally:
+            with _lock: _inflight.pop(key, None)
+
+    def stream(self, messages: List[Dict[str, str]], timeout: float | None = None,
+               use_cache: bool = True, temperature: float = 0.2):
+        """Yield completion tokens as they arrive. A fresh cache hit is yielded
+        in one piece; self.source says which ("cache" or "llm"). Streams are
+        not single-flighted. The socket is read on a daemon thread, so the
+        whole stream is held to one deadline: concurrent.futures.TimeoutError
+        is raised when it passes, after whatever tokens already arrived."""
+        full = [{"role": "system", "content": self.system_prompt}] + messages
+        key = prompt_key(MODEL, full, temperature)
+        hit = cache_get(key) if use_cache else None
+        if hit is not None:
+            self.source = "cache"; yield hit; return
+        self.source = "llm"
+        q, deadline = queue.Queue(), time.monotonic() + (timeout or TIMEOUT_S)
+        def pump():
+            try:
+                for chunk in client().chat.completions.create(model=MODEL, messages=full,
+                                                              temperature=temperature, stream=True):
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta: q.put(delta)
+                q.put(None)
+            except BaseException as e:
+                q.put(e)
+        threading.Thread(target=pump, name="llm-stream", daemon=True).start()
+        parts = []
+        while True:
+            try: item = q.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty: raise FutureTimeout() from None
+            if item is None: break
+            if isinstance(item, BaseException): raise item
+            parts.append(item)
+            yield item
+        if use_cache: cache_put(key, "".join(parts))
 
     def chat(self, messages: List[Dict[str, str]]) -> str:
-        resp = client.chat.completions.create(
-            model=MODEL,
-            messages=[{"role":"system","content": self.system_prompt}] + messages,
-            temperature=0.2,
-        )
-        return resp.choices[0].message.content
+        return self.complete(messages)[0]
@@ -0,0 +1,118 @@
+import json, math
+
+# Many canary records gated in one pass, with the same decisions and reason
+# strings as canary.gate. One JSON object per line:
+#   {"service": "checkout", "co": 970, "ct": 1000, "bo": 990, "bt": 1000,
+#    "cp95": 320, "bp95": 300, "cp99": 480, "bp99": 450}
+# canary_metrics.json-style names (canary_ok, canary_p95_ms, ...) work too.
+# Per-service overrides live under "services" in the policy:
+#   {"max_p95_regress_pct": 5.0, "services": {"search": {"max_p95_regress_pct": 10.0}}}
+FIELDS = {"co": "canary_ok", "ct": "canary_total", "bo": "base_ok", "bt": "base_total",
+          "cp95": "canary_p95_ms", "bp95": "base_p95_ms", "cp99": "canary_p99_ms", "bp99": "base_p99_ms"}
+REQUIRED = ("co", "ct", "bo", "bt", "cp95", "bp95")
+
+def policy_for(policy: dict, service: str) -> dict:
+    p = {k: v for k, v in policy.items() if k != "services"}
+    p.update((policy.get("services") or {}).get(service) or {})
+    return p
+
+def _field(r, k):
+    v = r.get(k)
+    return r.get(FIELDS[k]) if v is None else v
+
+def _num(v):
+    # None (field absent) passes through; anything else must be one finite number
+    if v is None: return None
+    if isinstance(v, bool) or not isinstance(v, (int, float, str)): raise ValueError(v)
+    x = float(v)
+    if not math.isfinite(x): raise ValueError(v)
+    return x if isinstance(v, str) else v
+
+def _coerce(r):
+    """(metric values by short name, first field that isn't a number or None)."""
+    vals = {}
+    for k in FIELDS:
+        try: vals[k] = _num(_field(r, k))
+        except (TypeError, ValueError, OverflowError): return vals, k
+    return vals, None
+
+def read(lines):
+    """(line number, record) per non-blank line; record is None when the
+    line is not a JSON object."""
+    for i, ln in enumerate(lines, 1):
+        ln = ln.strip()
+        if not ln: continue
+        try: r = json.loads(ln)
+        except ValueError: r = None
+        yield i, r if isinstance(r, dict) else None
+
+def evaluate(records, policy: dict):
+    """Decisions for a list of records, in order. Every metric and threshold
+    is a numpy column, so the checks run once for the whole batch; only the
+    rows that fail a check get a reason string. Each record's metrics are
+    checked first, so one non-numeric value only fails its own row."""
+    import numpy as np
+    n = len(records)
+    svc = [str(r.get("service", r.get("name", i))) for i, r in enumerate(records)]
+    rows = [_coerce(r) for r in records]
+    bad = [b for _, b in rows]
+    raw = {k: [None if b else v.get(k) for v, b in rows] for k in FIELDS}
+    missing = [None if bad[i] else next((k for k in REQUIRED if raw[k][i] is None), None) for i in range(n)]
+    col = lambda k, fill=0.0: np.array([fill if v is None else v for v in raw[k]], dtype=float)
+    co, ct, bo, bt, cp95, bp95 = (col(k) for k in REQUIRED)
+    has99 = np.array([c is not None and b not in (None, 0) for c, b in zip(raw["cp99"], raw["bp99"])], dtype=bool)
+    cp99, bp99 = col("cp99"), col("bp99", 1.0)
+    pols = [policy_for(policy, s) for s in svc]
+    min_total = np.array([int(p.get("min_total_per_arm", 0)) for p in pols], dtype=float)
+    thresh = np.array([float(p.get("min_success_delta_pct", -1.0)) for p in pols])
+    max_p95 = np.array([float(p.get("max_p95_regress_pct", 5.0)) for p in pols])
+    max_p99 = np.array([float(p["max_p99_regress_pct"]) if p.get("max_p99_regress_pct") is not None else np.inf
+                        for p in pols])
+
+    valid = (np.minimum(ct, bt) > 0) & (bp95 > 0) & np.array([m is b is None for m, b in zip(missing, bad)], dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sr_c, sr_b = co / ct, bo / bt
+        delta = (sr_c - sr_b) * 100.0
+        p95 = ((cp95 - bp95) / bp95) * 100.0
+        p99 = np.where(has99, ((cp99 - bp99) / np.where(has99, bp99, 1.0)) * 100.0, np.nan)
+    small = valid & ((ct < min_total) | (bt < min_total))
+    worse = valid & (delta < thresh)
+    slow95 = valid & (p95 > max_p95)
+    slow99 = valid & has99 & (p99 > max_p99)
+    hold = small | worse | slow95 | slow99
+
+    L = lambda a: a.tolist()
+    sr_c, sr_b, delta, p95, p99 = L(sr_c), L(sr_b), L(delta), L(p95), L(p99)
+    out = []
+    for i in range(n):
+        if bad[i]:
+            out.append({"service": svc[i], "error": f"invalid field {bad[i]}"}); continue
+        if missing[i]:
+            out.append({"service": svc[i], "error": f"missing field {missing[i]}"}); continue
+        if not valid[i]:
+            out.append({"service": svc[i], "error": "invalid inputs"}); continue
+        reasons = []
+        if hold[i]:
+            if small[i]:
+                reasons.append(f"insufficient sample (canary {raw['ct'][i]}, base {raw['bt'][i]}, need = {int(min_total[i])})")
+            if worse[i]:
+                reasons.append(f"success delta {delta[i]:.2f}% < {thresh[i]:.2f}%")
+            if slow95[i]:
+                reasons.append(f"p95 regression {p95[i]:.2f}% > {max_p95[i]:.2f}%")
+            if slow99[i]:
+                reasons.append(f"p99 regression {p99[i]:.2f}% > {max_p99[i]:.2f}%")
+        out.append({"service": svc[i], "canary_success": sr_c[i], "base_success": sr_b[i],
+                    "success_delta_pct": delta[i], "p95_regress_pct": p95[i],
+                    "p99_regress_pct": p99[i] if has99[i] else None,
+                    "decision": "Hold canary" if reasons else "Continue", "reasons": reasons})
+    return out
+
+def run(lines, policy: dict, write):
+    """Gate every record from `lines` and write() one JSON line per decision,
+    in input order. A malformed line is held as {"line": n, "error": "invalid
+    json"} instead of aborting the wave. Returns (decisions, holds, malformed)."""
+    rows = list(read(lines))
+    good = iter(evaluate([r for _, r in rows if r is not None], policy))
+    res = [next(good) if r is not None else {"line": i, "error": "invalid json"} for i, r in rows]
+    for r in res: write(json.dumps(r) + "\n")
+    return len(res), sum(1 for r in res if r.get("decision") != "Continue"), sum(1 for _, r in rows if r is None)
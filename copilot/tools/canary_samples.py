@@ -0,0 +1,123 @@
+import json, sys
+from copilot.tools.canary import gate
+from copilot.tools.sketch import LogHistogram, two_proportion
+
+# Raw per-request samples, one JSON object per line:
+#   {"arm": "canary", "latency_ms": 212.5, "ok": true}
+# "arm" may be omitted when each arm has its own file; "status" (HTTP code,
+# ok when < 500) stands in for "ok"; "duration_ms"/"ms" for "latency_ms".
+# A .json file may instead hold {"canary": [...], "base": [...]} arrays.
+ARMS = {"canary": "canary", "base": "base", "baseline": "base", "stable": "base"}
+BATCH = 65536   # lines parsed and bucketed together
+
+class Arm:
+    __slots__ = ("hist", "ok", "total")
+    def __init__(self, alpha=0.01):
+        self.hist, self.ok, self.total = LogHistogram(alpha), 0, 0
+
+    def merge(self, other: "Arm") -> "Arm":
+        self.hist.merge(other.hist); self.ok += other.ok; self.total += other.total
+        return self
+
+LATENCY_KEYS = ("latency_ms", "duration_ms", "ms")
+
+def _columns(recs):
+    """(latency list, ok count) for a batch. Field names are picked from the
+    first record, so a homogeneous export costs one dict lookup per field."""
+    first = recs[0]
+    lk = next((k for k in LATENCY_KEYS if k in first), "latency_ms")
+    lat = [r.get(lk) for r in recs]   # None -> NaN in the histogram
+    if "ok" in first or "status" not in first and "code" not in first:
+        ok = sum(1 for r in recs if r.get("ok"))
+    else:
+        sk = "status" if "status" in first else "code"
+        ok = sum(1 for r in recs if int(r.get(sk) or 999) < 500)
+    return lat, ok
+
+def _parse(lines):
+    # one json.loads per batch is several times faster than one per line;
+    # a malformed line sends just that batch down the slow, skipping path
+    try:
+        return json.loads("[" + ",".join(lines) + "]")
+    except ValueError:
+        out = []
+        for ln in lines:
+            try: out.append(json.loads(ln))
+            except ValueError: pass
+        return out
+
+def _batches(f):
+    buf = []
+    for ln in f:
+        ln = ln.strip()
+        if ln: buf.append(ln)
+        if len(buf) >= BATCH:
+            yield _parse(buf); buf = []
+    if buf: yield _parse(buf)
+
+def _feed(arms, records, arm=None):
+    recs = [r for r in records if isinstance(r, dict)]
+    if arm:
+        groups = {arm: recs}
+    else:
+        labels = [r.get("arm") for r in recs]
+        groups = {}
+        for v in set(labels):
+            a = ARMS.get(str(v).lower())
+            if a is not None:
+                groups.setdefault(a, []).extend(r for r, x in zip(recs, labels) if x == v)
+    for a, rs in groups.items():
+        if not rs: continue
+        lat, ok = _columns(rs)
+        acc = arms[a]
+        acc.hist.add_many(lat); acc.ok += ok; acc.total += len(rs)
+
+def read(path: str, arms: dict, arm: str | None = None):
+    """Stream one samples file ("-" = stdin) into the per-arm accumulators."""
+    if path == "-":
+        for b in _batches(sys.stdin): _feed(arms, b, arm)
+        return
+    if path.endswith(".json"):
+        from copilot.tools.jsonstream import iter_arrays
+        keys = [k for k, a in ARMS.items() if not arm or a == arm]
+        bufs = {ARMS[k]: [] for k in keys}
+        with open(path, "r", encoding="utf-8") as f:
+            # one pass over the file; each array is routed to its arm by key
+            for key, r in iter_arrays(iter(lambda: f.read(1 << 20), ""), keys):
+                buf = bufs[ARMS[key]]; buf.append(r)
+                if len(buf) >= BATCH: _feed(arms, buf, ARMS[key]); buf.clear()
+        for a, buf in bufs.items(): _feed(arms, buf, a)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for b in _batches(f): _feed(arms, b, arm)
+
+def _q(h, q, confidence):
+    est, lo, hi = h.quantile_ci(q, confidence)
+    return {"value": est, "ci_low": lo, "ci_high": hi}
+
+def analyze(arms: dict, policy: dict, confidence: float = 0.95) -> dict:
+    """Gate the two arms with canary.gate (same decision and reasons), plus
+    quantile confidence intervals and a success-rate z-test."""
+    c, b = arms["canary"], arms["base"]
+    stats = {}
+    for name, a in (("canary", c), ("base", b)):
+        stats[name] = {"total": a.total, "ok": a.ok, "latency_samples": a.hist.n,
+                       **{f"p{int(q * 100)}": _q(a.hist, q, confidence) for q in (0.5, 0.95, 0.99)}}
+    cp95, bp95 = stats["canary"]["p95"]["value"], stats["base"]["p95"]["value"]
+    cp99, bp99 = stats["canary"]["p99"]["value"], stats["base"]["p99"]["value"]
+    out = gate(c.ok, c.total, b.ok, b.total, cp95 or 0.0, bp95 or 0.0, policy, cp99, bp99)
+    tests = {"success": two_proportion(c.ok, c.total, b.ok, b.total)}
+    for p in ("p50", "p95", "p99"):
+        cs, bs = stats["canary"][p], stats["base"][p]
+        # intervals that don't overlap: the shift is unlikely to be sampling noise
+        sig = None if None in (cs["ci_low"], bs["ci_high"]) else cs["ci_low"] > bs["ci_high"]
+        tests[p] = {"canary_slower": sig}
+    out.update({"confidence": confidence, "arms": stats, "tests": tests})
+    return out
+
+def run(samples=(), canary=(), base=(), policy=None, confidence=0.95, alpha=0.01) -> dict:
+    arms = {"canary": Arm(alpha), "base": Arm(alpha)}
+    for p in samples: read(p, arms)
+    for p in canary: read(p, arms, "canary")
+    for p in base: read(p, arms, "base")
+    return analyze(arms, policy or {}, confidence)
@@ -0,0 +1,124 @@
+import hashlib, re
+
+# Variable tokens (uuids, hex ids, numbers, ips, host:port) collapse to one
+# wildcard in a single regex pass.
+_MASK = re.compile(r'\b(?=[\da-fA-F])(?:0x[0-9a-fA-F]+|[0-9a-fA-F][0-9a-fA-F-]{15,}|\d[\d.:]*)\b')
+WILDCARD = "<*>"
+# Coarser: any token with a digit in it (timestamps, "120ms", "svc-3:8080")
+# becomes a wildcard. Used as the key of signature sketches, where every
+# distinct key costs a counter.
+_SHAPE = re.compile(r'\S*\d\S*|\b[0-9a-fA-F][0-9a-fA-F-]{15,}\b')
+
+def template_id(template: str) -> str:
+    """Stable short id for a template string (same text -> same id across runs)."""
+    return hashlib.blake2b(template.encode("utf-8", "replace"), digest_size=4).hexdigest()
+
+class Cluster:
+    __slots__ = ("tokens", "count", "_text", "id")
+
+    def __init__(self, tokens, key=()):
+        self.tokens = tokens
+        self.count = 0
+        self._text = None
+        # fixed at creation (parse-tree leaf + first template), so the id
+        # survives later generalization of the template text
+        self.id = template_id(" ".join(map(str, key)) + "\x1f" + " ".join(tokens))
+
+    @property
+    def template(self) -> str:
+        if self._text is None:
+            self._text = " ".join(self.tokens)
+        return self._text
+
+class TemplateMiner:
+    """Drain-style log template miner.
+
+    Lines are masked, split on whitespace and routed through a fixed-depth
+    parse tree keyed by (token count, first two tokens). Within a leaf the
+    most similar cluster absorbs the line when similarity >= `sim`, turning
+    differing positions into wildcards. Lines whose masked text was seen
+    before skip the tree via an exact template cache."""
+
+    def __init__(self, sim: float = 0.5, max_leaf: int = 64, max_tokens: int = 40):
+        self.sim = sim
+        self.max_leaf = max_leaf
+        self.max_tokens = max_tokens
+        self.tree = {}
+        self.cache = {}
+        self.clusters = []
+
+    def add(self, line: str, n: int = 1) -> Cluster:
+        masked = _MASK.sub(WILDCARD, line.strip())
+        c = self.cache.get(masked)
+        if c is None:
+            c = self._match(masked)
+            if len(self.cache) < 200_000:
+                self.cache[masked] = c
+        c.count += n
+        return c
+
+    def add_many(self, lines) -> None:
+        # same as add() per line, with lookups hoisted out of the hot loop
+        sub, cache, match = _MASK.sub, self.cache, self._match
+        for line in lines:
+            masked = sub(WILDCARD, line.strip())
+            c = cache.get(masked)
+            if c is None:
+                c = match(masked)
+                if len(cache) < 200_000:
+                    cache[masked] = c
+            c.count += 1
+
+    def _match(self, masked: str) -> Cluster:
+        toks = masked.split()
+        if len(toks) > self.max_tokens:
+            toks = toks[:self.max_tokens - 1] + [WILDCARD]
+        key = (len(toks), toks[0] if toks else "", toks[1] if len(toks) > 1 else "")
+        leaf = self.tree.setdefault(key, [])
+        best, best_sim = None, -1.0
+        for c in leaf:
+            same = sum(1 for a, b in zip(c.tokens, toks) if a == b or a == WILDCARD)
+            s = same / len(toks) if toks else 1.0
+            if s > best_sim:
+                best, best_sim = c, s
+        if best is not None and (best_sim >= self.sim or len(leaf) >= self.max_leaf):
+            if best_sim < 1.0:
+                best.tokens = [a if a == b else WILDCARD for a, b in zip(best.tokens, toks)]
+                best._text = None
+            return best
+        c = Cluster(toks, key)
+        leaf.append(c); self.clusters.append(c)
+        return c
+
+    def top(self, k: int = 10, width: int | None = None) -> list[dict]:
+        ranked = sorted(self.clusters, key=lambda c: c.count, reverse=True)[:k]
+        out = []
+        for c in ranked:
+            t = c.template
+            out.append({"id": c.id, "message": t[:width] if width else t, "count": c.count})
+        return out
+
+def shape(line: str) -> str:
+    return _SHAPE.sub(WILDCARD, line.strip())
+
+def mine_sketch(sk, k: int = 10, width: int | None = None) -> list[dict]:
+    """Signatures from a SpaceSaving sketch of shape() keys: its tracked keys
+    are mined into templates, weighted by their counts. A signature whose
+    count may be overestimated carries the bound as "err"."""
+    m, errs = TemplateMiner(), {}
+    for key, n, err in sk.top():
+        c = m.add(key, n)
+        if err: errs[c] = errs.get(c, 0) + err
+    ranked = sorted(m.clusters, key=lambda c: c.count, reverse=True)[:k]
+    out = []
+    for c in ranked:
+        t = c.template
+        d = {"id": c.id, "message": t[:width] if width else t, "count": c.count}
+        if c in errs: d["err"] = errs[c]
+        out.append(d)
+    return out
+
+def mine(lines, k: int = 10, width: int | None = None) -> list[dict]:
+    m = TemplateMiner()
+    m.add_many(lines)
+    return m.top(k, width)
@@ -0,0 +1,59 @@
+import os, random, threading, time
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as ConnError
+from copilot.tools.trace import span
+
+# Default timeouts (seconds) per endpoint; override with HTTP_TIMEOUT_<NAME>,
+# e.g. HTTP_TIMEOUT_LOKI_RANGE=30.
+TIMEOUTS = {"prom": 5.0, "prom_range": 15.0, "loki": 8.0, "loki_range": 10.0}
+RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+BACKOFF_S = float(os.getenv("HTTP_BACKOFF_S", "0.2"))
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+RETRY_STATUS = {429, 502, 503, 504}
+
+_lock = threading.Lock()
+_session = None
+
+def session() -> requests.Session:
+    """Process-wide session: keep-alive connections pooled per host."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=POOL_SIZE)
+                s.mount("http://", adapter); s.mount("https://", adapter)
+                s.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+                _session = s
+    return _session
+
+def timeout_for(endpoint: str) -> float:
+    return float(os.getenv(f"HTTP_TIMEOUT_{endpoint.upper()}", TIMEOUTS.get(endpoint, 10.0)))
+
+def get(url: str, params: dict | None = None, endpoint: str = "prom", timeout: float | None = None,
+        stream: bool = False):
+    """GET through the shared pool. Connection errors and 429/5xx gateway
+    responses are retried up to RETRIES times with full-jitter backoff; read
+    timeouts are not retried. Raises like requests.get on final failure."""
+    with span("http", endpoint=endpoint) as s:
+        r = _get(url, params, endpoint, timeout, stream, s)
+        # streamed bodies are read by the caller, so only their headers are timed here
+        s.set(status=r.status_code, bytes=int(r.headers.get("Content-Length") or 0) if stream else len(r.content))
+        return r
+
+def _get(url, params, endpoint, timeout, stream, s):
+    t = timeout if timeout is not None else timeout_for(endpoint)
+    for attempt in range(RETRIES + 1):
+        if attempt: s.set(retries=attempt)
+        last = attempt == RETRIES
+        try:
+            r = session().get(url, params=params, timeout=t, stream=stream)
+        except ConnError:
+            if last: raise
+        else:
+            if last or r.status_code not in RETRY_STATUS:
+                r.raise_for_status()
+                return r
+            r.close()
+        time.sleep(random.uniform(0, BACKOFF_S * (2 ** attempt)))
@@ -0,0 +1,192 @@
+import json, os, subprocess, threading
+
+KUBECTL = os.getenv("KUBECTL", "kubectl")
+KINDS = ("pods", "events", "nodes")
+RELIST_BACKOFF_S = 2.0
+WATCH_TIMEOUT_S = 300
+
+def _api_path(kind, ns=None):
+    if kind == "nodes" or not ns:
+        return f"/api/v1/{kind}"
+    return f"/api/v1/namespaces/{ns}/{kind}"
+
+def _index_keys(kind, obj):
+    md = obj.get("metadata", {}) or {}
+    ns = md.get("namespace", "")
+    yield "namespace", ns
+    if kind == "pods":
+        yield "phase", (obj.get("status", {}) or {}).get("phase", "")
+        for o in md.get("ownerReferences", []) or []:
+            yield "owner", f"{o.get('kind','')}/{o.get('name','')}"
+    elif kind == "events":
+        yield "reason", obj.get("reason", "")
+        inv = obj.get("involvedObject", {}) or {}
+        yield "involved", f"{inv.get('kind','')}/{inv.get('name','')}"
+
+class Store:
+    """In-memory copy of one resource kind, indexed by namespace plus
+    phase/owner (pods) or reason/involvedObject (events)."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.lock = threading.RLock()
+        self.objs = {}     # (namespace, name) -> object
+        self.index = {}    # index name -> value -> set of keys
+        self.resource_version = ""
+
+    def _key(self, obj):
+        md = obj.get("metadata", {}) or {}
+        return md.get("namespace", ""), md.get("name", "")
+
+    def _unindex(self, key, obj):
+        for name, val in _index_keys(self.kind, obj):
+            keys = self.index.get(name, {}).get(val)
+            if keys:
+                keys.discard(key)
+                if not keys: del self.index[name][val]
+
+    def upsert(self, obj):
+        key = self._key(obj)
+        with self.lock:
+            old = self.objs.get(key)
+            if old is not None: self._unindex(key, old)
+            self.objs[key] = obj
+            for name, val in _index_keys(self.kind, obj):
+                self.index.setdefault(name, {}).setdefault(val, set()).add(key)
+
+    def delete(self, obj):
+        key = self._key(obj)
+        with self.lock:
+            old = self.objs.pop(key, None)
+            if old is not None: self._unindex(key, old)
+
+    def replace(self, items, resource_version=""):
+        with self.lock:
+            self.objs, self.index = {}, {}
+            for it in items: self.upsert(it)
+            self.resource_version = resource_version
+
+    def list(self, namespace=None, **where):
+        """Objects matching every given index value, e.g. list("default", phase="Pending")."""
+        if namespace: where["namespace"] = namespace
+        with self.lock:
+            if not where:
+                return list(self.objs.values())
+            keys = None
+            for name, val in where.items():
+                hit = self.index.get(name, {}).get(val, set())
+                keys = set(hit) if keys is None else keys & hit
+                if not keys: return []
+            return [self.objs[k] for k in keys]
+
+class Informer:
+    """List once, then follow a resourceVersion watch via `kubectl get --raw`,
+    applying ADDED/MODIFIED/DELETED events to a Store. Relists on 410 Gone
+    or when the watch stream breaks."""
+
+    def __init__(self, kind, namespace=None):
+        self.kind, self.namespace = kind, namespace
+        self.store = Store(kind)
+        self.synced = threading.Event()
+        self._stop = threading.Event()
+        self._proc = None
+        self._thread = None
+
+    def _list(self):
+        out = subprocess.run([KUBECTL, "get", "--raw", _api_path(self.kind, self.namespace)],
+                             capture_output=True, text=True, timeout=30)
+        if out.returncode != 0:
+            raise RuntimeError(out.stderr.strip() or "list failed")
+        data = json.loads(out.stdout)
+        self.store.replace(data.get("items", []) or [], (data.get("metadata", {}) or {}).get("resourceVersion", ""))
+        self.synced.set()
+
+    def _watch(self):
+        path = (f"{_api_path(self.kind, self.namespace)}?watch=1&allowWatchBookmarks=true"
+                f"&timeoutSeconds={WATCH_TIMEOUT_S}&resourceVersion={self.store.resource_version}")
+        self._proc = subprocess.Popen([KUBECTL, "get", "--raw", path], stdout=subprocess.PIPE,
+                                      stderr=subprocess.DEVNULL, text=True, bufsize=1)
+        n = 0
+        try:
+            for line in self._proc.stdout:
+                if self._stop.is_set(): return True
+                if not line.strip(): continue
+                ev = json.loads(line); n += 1
+                t, obj = ev.get("type"), ev.get("object", {}) or {}
+                if t == "ERROR":
+                    return False  # usually 410 Gone: resourceVersion too old
+                rv = (obj.get("metadata", {}) or {}).get("resourceVersion")
+                if t in ("ADDED", "MODIFIED"): self.store.upsert(obj)
+                elif t == "DELETED": self.store.delete(obj)
+                if rv: self.store.resource_version = rv
+        except ValueError:
+            return False
+        finally:
+            self._proc.kill(); self._proc.wait()
+        # a clean server-side timeout resumes from the last resourceVersion; a
+        # non-zero exit or a stream that ended with no events (watch denied,
+        # bad kubeconfig, apiserver unreachable) counts as a failure
+        return self._proc.returncode == 0 and n > 0
+
+    def _loop(self):
+        need_list = not self.synced.is_set()
+        while not self._stop.is_set():
+            try:
+                if need_list: self._list()
+                need_list = not self._watch()
+            except Exception:
+                need_list = True
+            if need_list:
+                # never relist/re-watch in a tight loop after a failure
+                self._stop.wait(RELIST_BACKOFF_S)
+
+    def start(self, wait_s=15.0):
+        self._thread = threading.Thread(target=self._loop, name=f"informer-{self.kind}", daemon=True)
+        self._thread.start()
+        self.synced.wait(wait_s)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._proc and self._proc.poll() is None: self._proc.kill()
+
+_INFORMERS = {}  # (kind, namespace or "") -> Informer
+_LOCK = threading.Lock()
+
+def start(kinds=KINDS, namespace=None, wait_s=15.0):
+    """Start (or reuse) informers for `kinds`; namespace=None watches all namespaces."""
+    out = []
+    for kind in kinds:
+        key = (kind, "" if kind == "nodes" else (namespace or ""))
+        with _LOCK:
+            inf = _INFORMERS.get(key)
+            if inf is None:
+                inf = _INFORMERS[key] = Informer(kind, key[1] or None)
+                fresh = True
+            else:
+                fresh = False
+        out.append(inf.start(wait_s) if fresh else inf)
+    return out
+
+def stop_all():
+    with _LOCK:
+        for inf in _INFORMERS.values(): inf.stop()
+        _INFORMERS.clear()
+
+def store(kind, namespace=None):
+    """Synced store that covers `namespace` (a namespaced or cluster-wide informer), else None."""
+    for key in ((kind, namespace or ""), (kind, "")):
+        inf = _INFORMERS.get(key)
+        if inf is not None and inf.synced.is_set():
+            return inf.store
+    return None
+
+def cached(kind, namespace=None, all_namespaces=False, **where):
+    """{"items": [...]} from a running informer, or None if nothing covers it
+    (callers then fall back to kubectl). Namespaced kinds need an explicit
+    namespace (or all_namespaces=True, served only by a cluster-wide
+    informer), since kubectl's default one depends on the current context."""
+    if kind != "nodes" and not namespace and not all_namespaces: return None
+    s = store(kind, namespace)
+    if s is None: return None
+    return {"items": s.list(None if kind == "nodes" else namespace, **where)}
@@ -0,0 +1,62 @@
+import codecs, json, re
+
+_DEC = json.JSONDecoder()
+_SKIP = " \t\r\n,"
+
+def _text(chunks):
+    dec = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for c in chunks:
+        yield dec.decode(c) if isinstance(c, (bytes, bytearray)) else c
+    tail = dec.decode(b"", final=True)
+    if tail: yield tail
+
+def iter_array(chunks, key: str):
+    """Yield the elements of the first JSON array stored under `key`, decoding
+    one element at a time from an iterable of str/bytes chunks. Only the
+    current element (plus one read-ahead chunk) is held in memory."""
+    for _, obj in _arrays(chunks, (key,), once=True): yield obj
+
+def iter_arrays(chunks, keys):
+    """(key, element) for every JSON array stored under one of `keys`, in
+    document order, from a single pass over the chunks."""
+    return _arrays(chunks, tuple(keys), once=False)
+
+def _arrays(chunks, keys, once):
+    it = _text(chunks)
+    marker = re.compile(r'(?<!\\)"(%s)"\s*:\s*\[' % "|".join(map(re.escape, keys)))
+    keep = max(map(len, keys)) + 64
+    buf, pos, eof = "", 0, False
+    while True:
+        m = marker.search(buf, pos)
+        if not m:
+            chunk = next(it, None)
+            if chunk is None: return
+            buf = buf[max(pos, len(buf) - keep):] + chunk; pos = 0
+            continue
+        key, pos = m.group(1), m.end()
+        while True:
+            while pos < len(buf) and buf[pos] in _SKIP: pos += 1
+            if pos < len(buf):
+                if buf[pos] == "]": pos += 1; break
+                try:
+                    obj, end = _DEC.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof: return  # truncated or malformed input
+                else:
+                    pos = end
+                    yield key, obj
+                    continue
+            elif eof:
+                return
+            # element incomplete: at least double the buffer before retrying so
+            # large elements still decode in amortised linear time
+            parts = [buf[pos:]]; size = len(parts[0]); pos = 0
+            need = max(2 * size, 65536)
+            while size < need:
+                chunk = next(it, None)
+                if chunk is None:
+                    eof = True
+                    break
+                parts.append(chunk); size += len(chunk)
+            buf = "".join(parts)
+        if once: return
@@ -1,41 +1,102 @@
-import json, subprocess
-
-def _run(args, ns=None):
-    cmd = ["kubectl"] + args + (["-n", ns] if ns else [])
-    try:
-        p = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        return p.returncode, p.stdout, p.stderr
-    except Exception as e:
-        return 1, "", str(e)
-
-def get_json(kind, ns=None):
-    code, out, err = _run(["get", kind, "-o", "json"], ns)
+import json, subprocess, threading, time
+from copilot.tools import informer
+from copilot.tools.jsonstream import iter_array
+from copilot.tools.podrecords import PodRecord, PodTable
+from copilot.tools.redact import redact
+from copilot.tools.trace import span
+
+def _run(args, ns=None, timeout=10):
+    cmd = [informer.KUBECTL] + args + (["-n", ns] if ns else [])
+    with span("kubectl", cmd=" ".join(args[:2]), namespace=ns or "") as s:
+        try:
+            p = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+            s.set(exit=p.returncode, bytes=len(p.stdout))
+            return p.returncode, p.stdout, p.stderr
+        except Exception as e:
+            s.set(error=type(e).__name__)
+            return 1, "", str(e)
+
+def _loads(out):
+    with span("parse.json", bytes=len(out)) as s:
+        obj = json.loads(out)
+        s.set(items=len(obj.get("items", []) or []))
+        return obj
+
+def get_json(kind, ns=None, all_namespaces=False):
+    hit = informer.cached(kind, ns, all_namespaces=all_namespaces)
+    if hit is not None: return hit
+    if all_namespaces:
+        code, out, err = _run(["get", kind, "-A", "-o", "json"], timeout=60)
+    else:
+        code, out, err = _run(["get", kind, "-o", "json"], ns)
     if code != 0: return {}
-    try: return json.loads(out)
+    try: return _loads(out)
     except: return {}
 
+def namespaces(selector=None):
+    args = ["get", "namespaces", "-o", "json"] + (["-l", selector] if selector else [])
+    code, out, err = _run(args)
+    if code != 0: return []
+    try: return [it.get("metadata", {}).get("name", "") for it in _loads(out).get("items", [])]
+    except: return []
+
+def _stream(args, ns, timeout, fn):
+    """Run kubectl and decode its `items` array one element at a time from
+    the pipe, handing each to fn. Returns (exit code, items seen)."""
+    cmd = [informer.KUBECTL] + args + (["-n", ns] if ns else [])
+    with span("kubectl", cmd=" ".join(args[:2]), namespace=ns or "", streamed=True) as s:
+        try:
+            p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            s.set(error=type(e).__name__); return 1, 0
+        timer = threading.Timer(timeout, p.kill); timer.start()
+        nbytes, n = [0], 0
+        def chunks():
+            while True:
+                b = p.stdout.read(65536)
+                if not b: return
+                nbytes[0] += len(b); yield b
+        try:
+            for it in iter_array(chunks(), "items"):
+                fn(it); n += 1
+        finally:
+            p.stdout.close(); code = p.wait(); timer.cancel()
+        s.set(exit=code, bytes=nbytes[0], items=n)
+        return code, n
+
+def stream_pods(ns=None, all_namespaces=False) -> dict:
+    """{"ok", "cmd", "ms", "pods": PodTable}: from a running informer, or
+    streamed from `kubectl get pods -o json` without holding the whole list."""
+    hit = informer.cached("pods", ns, all_namespaces=all_namespaces)
+    if hit is not None:
+        return {"ok": True, "cmd": "informer:pods", "ms": 0, "pods": PodTable(map(PodRecord.from_item, hit["items"]))}
+    args = ["get", "pods", "-A", "-o", "json"] if all_namespaces else ["get", "pods", "-o", "json"]
+    started = time.time()
+    t = PodTable()
+    code, _ = _stream(args, None if all_namespaces else ns, 60 if all_namespaces else 10,
+                      lambda it: t.append(PodRecord.from_item(it)))
+    res = {"ok": code == 0, "cmd": " ".join([informer.KUBECTL] + args + (["-n", ns] if ns and not all_namespaces else [])),
+           "ms": int((time.time() - started) * 1000), "pods": t if code == 0 else PodTable()}
+    if code != 0: res["error"] = f"kubectl exited {code}"
+    return res
+
 def pods(ns):
     return get_json("pods", ns)
 
+def pod_table(ns, all_namespaces=False) -> PodTable:
+    """PodTable for a namespace (or the whole cluster); empty if kubectl fails."""
+    return stream_pods(ns, all_namespaces)["pods"]
+
 def events(ns):
     return get_json("events", ns)
 
-def worst_pod(ns):
-    data = pods(ns)
-    best = None
-    for item in data.get("items", []):
-        name = item.get("metadata", {}).get("name")
-        st = item.get("status", {})
-        restarts = sum(int(c.get("restartCount",0)) for c in st.get("containerStatuses",[]) or [])
-        waiting = [(c.get("state",{}).get("waiting",{}) or {}).get("reason","") for c in st.get("containerStatuses",[]) or []]
-        score = restarts + (5 if any("CrashLoopBackOff" in r for r in waiting) else 0)
-        if best is None or score > best[2]:
-            best = (name, st, score)
-    return best[0] if best else None
+def worst_pod(ns, data=None):
+    # pass an already-fetched PodTable to avoid a second kubectl call
+    return (pod_table(ns) if data is None else data).worst()
 
 def logs(pod, ns, tail=200, previous=False):
     if not pod: return ""
     args = ["logs", pod, "--tail", str(tail)]
     if previous: args.append("--previous")
     code, out, err = _run(args, ns)
-    return out if code == 0 else ""
+    return redact(out) if code == 0 else ""
@@ -1,19 +1,101 @@
-import subprocess, re
+import heapq, os, subprocess, re, threading, time
+from collections import deque
+from copilot.tools.drain import TemplateMiner, mine_sketch, shape
+from copilot.tools.informer import KUBECTL
+from copilot.tools.redact import redact, stream
+from copilot.tools.sketch import SpaceSaving
+from copilot.tools.trace import span
+
+MAX_LINE = 4096          # longer lines are cut before matching and mining
+MAX_TEMPLATES = 5000     # follow mode starts a fresh miner past this many templates
+ERROR_KEYS = 1024        # distinct error shapes extract_errors tracks (heavy-hitter sketch)
 
 def tail_pod_logs(pod: str, namespace: str | None = None, lines: int = 500) -> dict:
-    cmd = ["kubectl", "logs", pod, "--tail", str(lines)]
+    cmd = [KUBECTL, "logs", pod, "--tail", str(lines)]
     if namespace: cmd += ["-n", namespace]
-    try:
-        out = subprocess.check_output(cmd, stderr=subprocess.STDOUT, timeout=10).decode()
-        return {"ok": True, "text": out}
-    except Exception as e:
-        return {"ok": False, "error": str(e)}
+    with span("kubectl", cmd="logs", namespace=namespace or "", lines=lines) as s:
+        try:
+            out = subprocess.check_output(cmd, stderr=subprocess.STDOUT, timeout=10).decode()
+            s.set(bytes=len(out))
+            return {"ok": True, "text": redact(out)}
+        except Exception as e:
+            s.set(error=type(e).__name__)
+            return {"ok": False, "error": str(e)}
+
+_ERR = re.compile(r'(?im)(?:error|exception|timeout|fail(?:ed)?)[:\s].*')
 
 def extract_errors(text: str, top_k: int = 3) -> list[dict]:
-    errs = re.findall(r'(?im)(?:error|exception|timeout|fail(?:ed)?)[:\s].*', text)
-    counts = {}
-    for line in errs:
-        key = line.strip()[:160]
-        counts[key] = counts.get(key, 0) + 1
-    ranked = sorted(counts.items(), key=lambda x: x[1], reverse=True)[:top_k]
-    return [{"message": k, "count": v} for k, v in ranked]
+    with span("parse.extract_errors", bytes=len(text)) as s:
+        sk = SpaceSaving(ERROR_KEYS)
+        sk.update(shape(m.group(0)) for m in _ERR.finditer(text))
+        s.set(items=sk.n)
+        return mine_sketch(sk, top_k, width=160)
+
+class LogFollower:
+    """`kubectl logs -f` as an iterator of redacted lines, read from the pipe
+    as they arrive. close() (from any thread) stops the process and ends the
+    iteration."""
+
+    def __init__(self, pod: str, namespace: str | None = None, tail: int = 0):
+        cmd = [KUBECTL, "logs", "-f", pod, "--tail", str(tail)]
+        if namespace: cmd += ["-n", namespace]
+        self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def __iter__(self):
+        out = self.proc.stdout
+        try:
+            for text in stream(iter(lambda: os.read(out.fileno(), 65536), b"")):
+                yield from text.splitlines()
+        finally:
+            out.close()
+
+    def close(self) -> int:
+        if self.proc.poll() is None: self.proc.kill()
+        return self.proc.wait()
+
+class ErrorWindow:
+    """Rolling top-K error templates over the last window_s seconds. Counts
+    live in bucket_s-wide buckets; a bucket is subtracted from the running
+    totals when it slides out, so memory is bounded by the templates seen in
+    one window and top() costs one pass over them. Thread-safe."""
+
+    def __init__(self, window_s: float = 300, bucket_s: float = 10, width: int = 160):
+        self.window_s, self.bucket_s, self.width = window_s, bucket_s, width
+        self.miner = TemplateMiner()
+        self.buckets = deque()   # (bucket start, {cluster: count})
+        self.totals = {}
+        self.lines = self.errors = 0
+        self.lock = threading.Lock()
+
+    def _roll(self, now):
+        start = now - now % self.bucket_s
+        if not self.buckets or self.buckets[-1][0] < start:
+            self.buckets.append((start, {}))
+        while self.buckets[0][0] <= now - self.window_s - self.bucket_s:
+            for c, n in self.buckets.popleft()[1].items():
+                left = self.totals[c] - n
+                if left: self.totals[c] = left
+                else: del self.totals[c]
+
+    def add(self, line: str, now: float | None = None):
+        m = _ERR.search(line[:MAX_LINE])
+        with self.lock:
+            self.lines += 1
+            if not m: return
+            self.errors += 1
+            self._roll(time.monotonic() if now is None else now)
+            if len(self.miner.clusters) >= MAX_TEMPLATES:
+                self.miner = TemplateMiner()   # old clusters age out of the window
+            c = self.miner.add(m.group(0))
+            b = self.buckets[-1][1]
+            b[c] = b.get(c, 0) + 1
+            self.totals[c] = self.totals.get(c, 0) + 1
+
+    def top(self, k: int = 10, now: float | None = None) -> list[dict]:
+        with self.lock:
+            self._roll(time.monotonic() if now is None else now)
+            agg, text = {}, {}
+            for c, n in self.totals.items():
+                agg[c.id] = agg.get(c.id, 0) + n; text[c.id] = c.template
+        best = heapq.nlargest(k, agg.items(), key=lambda x: x[1])
+        return [{"id": i, "message": text[i][:self.width], "count": n} for i, n in best]
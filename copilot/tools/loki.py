@@ -1,25 +1,72 @@
-import time, re, requests, os
+import time, os
 from requests.exceptions import RequestException
+from copilot.tools.httpclient import get
+from copilot.tools.jsonstream import iter_array
+from copilot.tools.drain import mine_sketch, shape
+from copilot.tools.redact import redact
+from copilot.tools.sketch import SpaceSaving
+from copilot.tools.trace import span
+
+PAGE_LIMIT = int(os.getenv("LOKI_PAGE_LIMIT", "5000"))
+MAX_PAGES = int(os.getenv("LOKI_MAX_PAGES", "500"))
+# Error signatures are counted in one heavy-hitter sketch per pod, merged per
+# namespace, so memory stays fixed however many distinct messages stream by
+POD_KEYS = int(os.getenv("SIGNATURE_POD_KEYS", "128"))
+NAMESPACE_KEYS = int(os.getenv("SIGNATURE_NAMESPACE_KEYS", "1024"))
 
 def _now_ns(): return int(time.time()*1e9)
 
 def _vector(q, base="http://localhost:3100"):
-    try:
-        r = requests.get(f"{base}/loki/api/v1/query", params={"query": q}, timeout=8)
-        r.raise_for_status()
-        return r.json().get("data", {}).get("result", [])
-    except RequestException:
-        return []
-
-def _range(q, minutes, base="http://localhost:3100"):
-    end=_now_ns(); start=end-minutes*60*1_000_000_000
-    try:
-        r = requests.get(f"{base}/loki/api/v1/query_range",
-            params={"query": q, "start": start, "end": end, "limit": 2000, "direction": "backward"}, timeout=10)
-        r.raise_for_status()
-        return r.json().get("data", {}).get("result", [])
-    except RequestException:
-        return []
+    with span("loki.query", query=q[:80]) as s:
+        try:
+            r = get(f"{base}/loki/api/v1/query", params={"query": q}, endpoint="loki")
+            res = r.json().get("data", {}).get("result", [])
+            s.set(items=len(res))
+            return res
+        except RequestException:
+            return []
+
+def iter_range(q, start_ns, end_ns, base="http://localhost:3100", page=PAGE_LIMIT, max_pages=MAX_PAGES, meta=None):
+    """Yield (ts_ns, labels, line) for every entry in [start_ns, end_ns], with
+    secrets in the line redacted.
+
+    Pages forward through query_range with a timestamp cursor until the window
+    is covered, decoding each page one stream at a time, so memory is bounded
+    by the page size rather than the window. Entries sharing the cursor
+    timestamp are de-duplicated across page boundaries. Paging forward means
+    hitting max_pages drops the newest entries; a `meta` dict then gets
+    truncated=True and last_ts, the newest timestamp read."""
+    cursor, seen = start_ns, set()
+    if meta is not None: meta.update(truncated=False, last_ts=None)
+    for _ in range(max_pages):
+        n, last, at_last = 0, cursor, set()
+        try:
+            r = get(f"{base}/loki/api/v1/query_range",
+                params={"query": q, "start": cursor, "end": end_ns, "limit": page, "direction": "forward"},
+                endpoint="loki_range", stream=True)
+            with r:
+                for stream in iter_array(r.iter_content(65536), "result"):
+                    labels = stream.get("stream", {}) or {}
+                    lk = tuple(sorted(labels.items()))
+                    for ts, line in stream.get("values", []):
+                        n += 1; ts = int(ts)
+                        if ts == cursor and (lk, line) in seen:
+                            continue
+                        if ts > last:
+                            last, at_last = ts, set()
+                        if ts == last:
+                            at_last.add((lk, line))
+                        yield ts, labels, redact(line)
+        except (RequestException, ValueError):
+            return
+        if n < page or last >= end_ns:
+            return
+        if last == cursor:
+            # a full page on a single timestamp; step past it
+            cursor, seen = cursor + 1, set()
+        else:
+            cursor, seen = last, at_last
+    if meta is not None: meta.update(truncated=True, last_ts=last)
 
 def top_errors_by_pod(namespace="default", minutes=5, base_url=None):
     base = base_url or os.getenv("LOKI_URL","http://localhost:3100")
@@ -33,15 +80,75 @@ def top_errors_by_pod(namespace="default", minutes=5, base_url=None):
             pass
     return sorted(out, key=lambda x: x["rate"], reverse=True)[:10]
 
+def pod_sketches(rows, key=lambda labels: labels.get("pod", "")) -> tuple:
+    """({key(labels): SpaceSaving of line shapes}, line count) for
+    (ts, labels, line) rows."""
+    sks, n = {}, 0
+    for _, labels, line in rows:
+        k = key(labels)
+        sk = sks.get(k)
+        if sk is None: sk = sks[k] = SpaceSaving(POD_KEYS)
+        sk.add(shape(line)); n += 1
+    return sks, n
+
+def merged(sketches) -> SpaceSaving:
+    out = SpaceSaving(NAMESPACE_KEYS)
+    for sk in sketches: out.merge(sk)
+    return out
+
+class Signatures(list):
+    """Mined signatures; truncated/last_ts say whether the Loki page cap cut
+    the window short and the newest timestamp (ns) that was read."""
+    __slots__ = ("truncated", "last_ts")
+
+    def __init__(self, items=(), truncated=False, last_ts=None):
+        super().__init__(items)
+        self.truncated, self.last_ts = truncated, last_ts
+
+    def __eq__(self, other):
+        return list.__eq__(self, other) and getattr(other, "truncated", False) == self.truncated
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
 def sample_error_signatures(namespace="default", minutes=5, base_url=None, limit=5):
     base = base_url or os.getenv("LOKI_URL","http://localhost:3100")
     q = f'{{namespace="{namespace}"}} |= "ERROR"'
-    res = _range(q, minutes, base); counts={}
-    for stream in res:
-        for _, line in stream.get("values", []):
-            msg=line.strip()
-            msg=re.sub(r'\\b[0-9a-fA-F-]{12,}\\b','<id>',msg)
-            msg=re.sub(r'\\b\\d+\\b','<n>',msg)
-            counts[msg]=counts.get(msg,0)+1
-    top=sorted(counts.items(), key=lambda x:x[1], reverse=True)[:limit]
-    return [{"message":m, "count":c} for m,c in top]
+    end=_now_ns(); start=end-minutes*60*1_000_000_000
+    with span("loki.signatures", namespace=namespace) as s:
+        meta = {}
+        sks, n = pod_sketches(iter_range(q, start, end, base, meta=meta))
+        out = Signatures(mine_sketch(merged(sks.values()), limit), **meta)
+        s.set(lines=n, pods=len(sks), items=len(out))
+        if out.truncated: s.set(truncated=True, last_ts=out.last_ts)
+        return out
+
+def top_errors_by_namespace(minutes=5, base_url=None, selector='namespace=~".+"', limit=10):
+    """{namespace: [{"pod", "rate"}, ...]} from one `sum by (namespace, pod)` query."""
+    base = base_url or os.getenv("LOKI_URL","http://localhost:3100")
+    q = f'sum by (namespace, pod) (rate({{{selector}}} |= "ERROR" [{minutes}m]))'
+    out = {}
+    for s in _vector(q, base):
+        m = s.get("metric",{})
+        try: out.setdefault(m.get("namespace",""), []).append({"pod": m.get("pod",""), "rate": float(s.get("value",[0,"0"])[1])})
+        except Exception: pass
+    return {ns: sorted(v, key=lambda x: x["rate"], reverse=True)[:limit] for ns, v in out.items()}
+
+def error_signatures_by_namespace(minutes=5, base_url=None, selector='namespace=~".+"', limit=5):
+    """{namespace: signatures} from one paged ERROR-line stream: per-pod
+    sketches merged into one per namespace, then mined."""
+    base = base_url or os.getenv("LOKI_URL","http://localhost:3100")
+    q = f'{{{selector}}} |= "ERROR"'
+    end=_now_ns(); start=end-minutes*60*1_000_000_000
+    with span("loki.signatures", namespace="*") as s:
+        meta = {}
+        sks, n = pod_sketches(iter_range(q, start, end, base, meta=meta),
+                              lambda labels: (labels.get("namespace", ""), labels.get("pod", "")))
+        by_ns = {}
+        for (ns, _), sk in sks.items(): by_ns.setdefault(ns, []).append(sk)
+        s.set(lines=n, pods=len(sks), items=len(by_ns))
+        if meta.get("truncated"): s.set(**meta)
+        # one shared stream, so every namespace is cut at the same point
+        return {ns: Signatures(mine_sketch(merged(v), limit), **meta) for ns, v in by_ns.items()}
@@ -0,0 +1,122 @@
+import sys
+
+_I = sys.intern
+CRASHLOOP = "CrashLoopBackOff"
+OOM = "OOMKilled"
+
+def _reason(state, key):
+    return ((state or {}).get(key, {}) or {}).get("reason", "") or ""
+
+class PodRecord:
+    """The fields of one pod that the agent, cost scan and incident score
+    read: identity, phase, owner, and per container status (restarts,
+    waiting and last terminated reason) and spec (resource requests/limits).
+    Everything else in the kubectl item is dropped as soon as it is parsed."""
+    __slots__ = ("name", "namespace", "phase", "owner", "restarts", "waiting", "terminated", "containers")
+
+    def __init__(self, name, namespace, phase, restarts=(), waiting=(), containers=(), owner="", terminated=()):
+        self.name, self.namespace, self.phase, self.owner = name, namespace, phase, owner
+        self.restarts = restarts        # (int, ...) per container status
+        self.waiting = waiting          # (reason or "", ...) per container status
+        self.terminated = terminated    # (reason or "", ...) current or last termination, per container status
+        self.containers = containers    # ((name, req_cpu, req_mem, lim_cpu, lim_mem), ...) from the spec
+
+    @classmethod
+    def from_item(cls, it: dict) -> "PodRecord":
+        md, st = it.get("metadata", {}) or {}, it.get("status", {}) or {}
+        cs = st.get("containerStatuses", []) or []
+        ctrs = []
+        for c in (it.get("spec", {}) or {}).get("containers", []) or []:
+            res = c.get("resources") or {}
+            req, lim = res.get("requests") or {}, res.get("limits") or {}
+            ctrs.append((c.get("name", "ctr"), req.get("cpu"), req.get("memory"), lim.get("cpu"), lim.get("memory")))
+        own = (md.get("ownerReferences") or [{}])[0]
+        return cls(md.get("name", ""), _I(md.get("namespace", "") or ""), _I(st.get("phase", "") or ""),
+                   tuple(int(c.get("restartCount", 0) or 0) for c in cs),
+                   tuple(_I(_reason(c.get("state"), "waiting")) for c in cs),
+                   tuple(ctrs),
+                   _I(f"{own.get('kind', '')}/{own.get('name', '')}") if own else "",
+                   tuple(_I(_reason(c.get("state"), "terminated") or _reason(c.get("lastState"), "terminated"))
+                         for c in cs))
+
+    @property
+    def total_restarts(self) -> int:
+        return sum(self.restarts)
+
+    def _key(self):
+        return (self.name, self.namespace, self.phase, self.owner, self.restarts, self.waiting,
+                self.terminated, self.containers)
+
+    def __eq__(self, other):
+        return isinstance(other, PodRecord) and self._key() == other._key()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"PodRecord({self.namespace}/{self.name}, {self.phase}, restarts={self.restarts}, waiting={self.waiting})"
+
+def project(items) -> list:
+    """PodRecords for already-decoded pod dicts (e.g. an informer's store)."""
+    return [PodRecord.from_item(it) for it in items]
+
+class PodTable:
+    """Normalized pod status for one snapshot, one column per field. Built
+    once from PodRecords; crash detection, worst_pod, cost.scan and the
+    incident score all query it, so they agree on restarts and reasons."""
+    COLUMNS = ("name", "namespace", "phase", "owner", "restarts", "waiting", "terminated",
+               "crashloop", "oom", "containers")
+    __slots__ = COLUMNS
+
+    def __init__(self, records=()):
+        for c in self.COLUMNS: setattr(self, c, [])
+        for r in records: self.append(r)
+
+    def append(self, r: PodRecord):
+        self.name.append(r.name); self.namespace.append(r.namespace)
+        self.phase.append(r.phase); self.owner.append(r.owner)
+        self.restarts.append(r.total_restarts)
+        self.waiting.append(tuple(w for w in r.waiting if w))
+        self.terminated.append(tuple(t for t in r.terminated if t))
+        self.crashloop.append(any(CRASHLOOP in w for w in r.waiting))
+        self.oom.append(OOM in r.terminated)
+        self.containers.append(r.containers)
+
+    def __len__(self):
+        return len(self.name)
+
+    def __eq__(self, other):
+        return isinstance(other, PodTable) and all(getattr(self, c) == getattr(other, c) for c in self.COLUMNS)
+
+    __hash__ = None
+
+    def take(self, idx) -> "PodTable":
+        t = PodTable()
+        for c in self.COLUMNS:
+            col = getattr(self, c)
+            setattr(t, c, [col[i] for i in idx])
+        return t
+
+    def by_namespace(self) -> dict:
+        """{namespace: PodTable} in first-seen order."""
+        idx = {}
+        for i, ns in enumerate(self.namespace): idx.setdefault(ns, []).append(i)
+        return {ns: self.take(ix) for ns, ix in idx.items()}
+
+    def reasons(self, i) -> list:
+        """Waiting reasons, plus OOMKilled when a container was killed for memory."""
+        return list(self.waiting[i]) + ([OOM] if self.oom[i] else [])
+
+    def crashy(self, min_restarts=5) -> list:
+        """Row indices in a crash loop or with at least min_restarts restarts."""
+        return [i for i, (c, n) in enumerate(zip(self.crashloop, self.restarts)) if c or n >= min_restarts]
+
+    def crash_score(self, i) -> int:
+        return self.restarts[i] + (5 if self.crashloop[i] else 0)
+
+    def worst(self):
+        """Name of the pod with the highest crash score (first wins ties), or None."""
+        if not self.name: return None
+        return self.name[max(range(len(self.name)), key=self.crash_score)]
+
+    def restarts_by_pod(self) -> dict:
+        return dict(zip(self.name, self.restarts))
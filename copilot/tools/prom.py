@@ -1,9 +1,10 @@
-import requests
+import time
+from copilot.tools.httpclient import get
+from copilot.tools.trace import span
 
 def instant(query: str, base_url: str = "http://localhost:9090") -> float:
     url = f"{base_url}/api/v1/query"
-    r = requests.get(url, params={"query": query}, timeout=5)
-    r.raise_for_status()
+    r = get(url, params={"query": query}, endpoint="prom")
     data = r.json()
     if data.get("status") != "success":
         return 0.0
@@ -14,3 +15,53 @@ def instant(query: str, base_url: str = "http://localhost:9090") -> float:
         return float(res[0]["value"][1])
     except Exception:
         return 0.0
+
+MAX_POINTS = 11000  # Prometheus rejects range queries above 11k points per series
+
+def range_query(query: str, start: float, end: float, step: float, base_url: str = "http://localhost:9090",
+                cache: bool = True) -> list:
+    """Matrix result [{"metric": {...}, "values": [[ts, "v"], ...]}, ...] for
+    [start, end]. With cache=True the range is served from the local
+    step-aligned cache (see promcache) and only the uncached tail is fetched."""
+    with span("prom.range_query", query=query[:80], step=step) as s:
+        if cache:
+            from copilot.tools import promcache
+            res = promcache.range_query(_fetch_range, query, start, end, step, base_url)
+        else:
+            res = _fetch_range(query, start, end, step, base_url)
+        s.set(series=len(res), points=sum(len(r.get("values", [])) for r in res))
+        return res
+
+def _fetch_range(query, start, end, step, base_url):
+    # long ranges are split into MAX_POINTS-step requests and the series
+    # stitched back together by label set
+    url = f"{base_url}/api/v1/query_range"
+    series = {}
+    t = start
+    while t <= end:
+        stop = min(end, t + (MAX_POINTS - 1) * step)
+        r = get(url, params={"query": query, "start": t, "end": stop, "step": step}, endpoint="prom_range")
+        data = r.json()
+        if data.get("status") != "success":
+            return []
+        for res in data.get("data", {}).get("result", []) or []:
+            key = tuple(sorted(res.get("metric", {}).items()))
+            s = series.setdefault(key, {"metric": res.get("metric", {}), "values": []})
+            s["values"].extend(res.get("values", []))
+        t = stop + step
+    return list(series.values())
+
+def window_mean(query: str, window_min: int, step: int = 60, base_url: str = "http://localhost:9090") -> float:
+    """Mean over the last `window_min` minutes of `query` (summed across
+    series), sampled every `step` seconds through the range cache. For a
+    `rate(x[1m])` query at a 60 s step this is the rate over the window,
+    while repeated runs only fetch the newest samples."""
+    end = time.time()
+    res = range_query(query, end - window_min * 60 + step, end, step, base_url)
+    per_ts = {}
+    for r in res:
+        for ts, v in r.get("values", []):
+            try: x = float(v)
+            except ValueError: continue
+            if x == x: per_ts[ts] = per_ts.get(ts, 0.0) + x   # skip NaN
+    return sum(per_ts.values()) / len(per_ts) if per_ts else 0.0
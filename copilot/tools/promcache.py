@@ -0,0 +1,163 @@
+import hashlib, json, math, os, sqlite3, threading, time, zlib
+from copilot.tools.trace import annotate
+
+# Local cache for Prometheus range results, shared across processes through
+# one SQLite file. Results are stored per (query, step) in step-aligned
+# chunks of CHUNK_STEPS points; each chunk records the contiguous range
+# [lo, upto] it is known to be complete for, so a repeated query only
+# fetches what lies outside it, never the rest of the chunk.
+# Samples newer than FRESHNESS_S are returned but never counted as cached,
+# since late scrapes can still change them.
+PATH = os.getenv("PROM_CACHE_PATH", "out/prom-cache.sqlite")
+CHUNK_STEPS = int(os.getenv("PROM_CACHE_CHUNK_STEPS", "720"))
+FRESHNESS_S = float(os.getenv("PROM_CACHE_FRESHNESS_S", "60"))
+MAX_AGE_S = float(os.getenv("PROM_CACHE_MAX_AGE_S", str(7 * 86400)))   # unused this long -> evicted
+MAX_MB = float(os.getenv("PROM_CACHE_MAX_MB", "256"))
+ENABLED = os.getenv("PROM_CACHE", "1") != "0"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (key TEXT, step REAL, start REAL, lo REAL, upto REAL, data BLOB,
+                                   size INTEGER, atime REAL, PRIMARY KEY (key, step, start));
+CREATE INDEX IF NOT EXISTS chunks_atime ON chunks (atime);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER);
+"""
+VERSION = 2   # PRAGMA user_version; older cache files are dropped, not migrated
+
+STATS = {"hits": 0, "misses": 0, "fetches": 0, "evicted": 0}   # this process; steps for hits/misses
+_local = threading.local()
+
+def _conn():
+    c = getattr(_local, "conn", None)
+    if c is None:
+        d = os.path.dirname(PATH)
+        if d: os.makedirs(d, exist_ok=True)
+        c = sqlite3.connect(PATH, timeout=10, isolation_level=None)
+        c.execute("PRAGMA journal_mode=WAL"); c.execute("PRAGMA synchronous=NORMAL")
+        if c.execute("PRAGMA user_version").fetchone()[0] != VERSION:
+            c.executescript(f"DROP TABLE IF EXISTS chunks; DROP TABLE IF EXISTS counters; PRAGMA user_version = {VERSION};")
+        c.executescript(SCHEMA)
+        _local.conn = c
+    return c
+
+def normalize(query):
+    return " ".join(query.split())
+
+def _key(query, base_url):
+    return hashlib.sha1(f"{base_url}\0{normalize(query)}".encode()).hexdigest()
+
+def _mkey(metric): return json.dumps(metric, sort_keys=True)
+
+def _load(blob):
+    return {k: (m, v) for k, m, v in json.loads(zlib.decompress(blob))}
+
+def _dump(series):
+    return zlib.compress(json.dumps([[k, m, v] for k, (m, v) in series.items()], separators=(",", ":")).encode())
+
+def _count(c, **delta):
+    for k, v in delta.items():
+        STATS[k] += v
+        if v: c.execute("INSERT INTO counters VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + ?", (k, v, v))
+
+def range_query(fetch, query, start, end, step, base_url):
+    """fetch(query, start, end, step, base_url) through the cache. start/end
+    are aligned down to the step grid; the result has range_query's shape."""
+    if not ENABLED:
+        return fetch(query, start, end, step, base_url)
+    try:
+        return _cached(fetch, query, start, end, step, base_url)
+    except sqlite3.Error:
+        return fetch(query, start, end, step, base_url)
+
+def _cached(fetch, query, start, end, step, base_url):
+    c, key, now = _conn(), _key(query, base_url), time.time()
+    a, e = math.floor(start / step) * step, math.floor(end / step) * step
+    span = CHUNK_STEPS * step
+    settled = math.floor((now - FRESHNESS_S) / step) * step
+    first = math.floor(a / span) * span
+    c0s = [first + i * span for i in range(int(round((math.floor(e / span) * span - first) / span)) + 1)]
+    rows = c.execute("SELECT start, lo, upto, data FROM chunks WHERE key = ? AND step = ? AND start >= ? AND start <= ?",
+                     (key, step, c0s[0], c0s[-1])).fetchall()
+    stored = {s: (lo, u, _load(d)) for s, lo, u, d in rows}
+    # per chunk, the wanted part [wa, wb] is fetched where it lies outside the
+    # stored [lo, upto]; when it neither overlaps nor touches that range, only
+    # [wa, wb] is fetched (and, if newer, replaces it) so no gap is backfilled
+    chunks, gaps, hit = {}, [], 0
+    def want(g0, g1):
+        if gaps and abs(gaps[-1][1] + step - g0) < step / 2: gaps[-1][1] = g1
+        else: gaps.append([g0, g1])
+    for c0 in c0s:
+        wa, wb = max(a, c0), min(e, c0 + span - step)
+        lo, upto, series = stored.get(c0, (None, None, {}))
+        if lo is not None and wa <= upto + step and wb >= lo - step:
+            hit += max(0, int(round((min(upto, wb) - max(lo, wa)) / step)) + 1)
+            if wa < lo: want(wa, lo - step)
+            if wb > upto: want(upto + step, wb)
+            chunks[c0] = {"old": (lo, upto), "lo": min(lo, wa), "hi": max(upto, wb), "series": series, "save": True}
+        else:
+            want(wa, wb)
+            chunks[c0] = {"old": None, "lo": wa, "hi": wb, "series": {}, "save": lo is None or wa > upto}
+    miss = 0
+    for g0, g1 in gaps:
+        miss += int(round((min(g1, e) - max(g0, a)) / step)) + 1
+        for r in fetch(query, g0, g1, step, base_url):
+            m = r.get("metric", {}); k = _mkey(m)
+            for p in r.get("values", []):
+                ch = chunks.get(math.floor(p[0] / span) * span)
+                if ch is None or not ch["lo"] <= p[0] <= ch["hi"]: continue
+                if ch["old"] and ch["old"][0] <= p[0] <= ch["old"][1]: continue
+                ch["series"].setdefault(k, (m, []))[1].append(p)
+    for ch in chunks.values():
+        for m, v in ch["series"].values(): v.sort(key=lambda p: p[0])
+    c.execute("BEGIN IMMEDIATE")
+    try:
+        for c0, ch in chunks.items():
+            lo, upto = ch["lo"], min(ch["hi"], settled)
+            if ch["old"]: upto = max(upto, ch["old"][1])
+            if not ch["save"] or upto < lo or (ch["old"] and (lo, upto) == ch["old"]): continue
+            # persist only the settled part; fresher samples are refetched next time
+            blob = _dump({k: (m, [p for p in v if p[0] <= upto]) for k, (m, v) in ch["series"].items()})
+            c.execute("INSERT INTO chunks VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(key, step, start) DO UPDATE "
+                      "SET lo = excluded.lo, upto = excluded.upto, data = excluded.data, size = excluded.size, "
+                      "atime = excluded.atime WHERE excluded.upto >= chunks.upto",
+                      (key, step, c0, lo, upto, blob, len(blob), now))
+        c.execute("UPDATE chunks SET atime = ? WHERE key = ? AND step = ? AND start >= ? AND start <= ?",
+                  (now, key, step, c0s[0], c0s[-1]))
+        _count(c, hits=hit, misses=miss, fetches=len(gaps))
+        annotate(cache_hit_steps=hit, cache_miss_steps=miss)
+        if gaps: _evict(c, now)
+        c.execute("COMMIT")
+    except BaseException:
+        c.execute("ROLLBACK"); raise
+    out = {}
+    for c0 in c0s:
+        for k, (m, v) in chunks[c0]["series"].items():
+            pts = [p for p in v if a <= p[0] <= e]
+            if pts: out.setdefault(k, {"metric": m, "values": []})["values"].extend(pts)
+    return list(out.values())
+
+def _evict(c, now):
+    n = c.execute("DELETE FROM chunks WHERE atime < ?", (now - MAX_AGE_S,)).rowcount
+    total = c.execute("SELECT COALESCE(SUM(size), 0) FROM chunks").fetchone()[0]
+    limit = MAX_MB * 1024 * 1024
+    if total > limit:
+        # least recently used first, down to 90% of the limit
+        for key, step, start, size in c.execute("SELECT key, step, start, size FROM chunks ORDER BY atime").fetchall():
+            if total <= limit * 0.9: break
+            c.execute("DELETE FROM chunks WHERE key = ? AND step = ? AND start = ?", (key, step, start))
+            total -= size; n += 1
+    if n: _count(c, evicted=n)
+
+def stats():
+    """Counters for this process and, persisted in the cache file, for all processes."""
+    out = {"process": dict(STATS), "path": PATH, "enabled": ENABLED}
+    try:
+        c = _conn()
+        out["total"] = dict(c.execute("SELECT name, value FROM counters").fetchall())
+        out["chunks"], out["bytes"] = c.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM chunks").fetchone()
+    except sqlite3.Error as e:
+        out["error"] = str(e)
+    return out
+
+def clear():
+    c = _conn()
+    c.execute("DELETE FROM chunks"); c.execute("DELETE FROM counters")
@@ -0,0 +1,82 @@
+import codecs, re
+
+# Secret redaction for everything a tool hands back (kubectl output, pod logs,
+# Loki lines). One combined pattern is matched against a lowercased copy of
+# the text, and only at offsets where str.find located one of its keywords,
+# so text without secrets costs a lowercase copy plus a few substring scans.
+# Matches never cross a newline, which is what lets Redactor work chunk by
+# chunk: it only scans up to the last complete line.
+CHUNK = 1 << 16
+MAX_LINE = 1 << 20   # a partial line longer than this is flushed without waiting for its newline
+KEYWORDS = ("pass", "pwd", "api", "token", "secret", "authorization", "bearer")
+
+_VALUE = r'(?:"[^"\n]*"|[^\s"]+)'
+_RX = re.compile(r'(password|passwd|pwd|api[_-]?key|token|secret|authorization)[ \t]*[:=][ \t]*'
+                 r'(?:bearer[ \t]+)?' + _VALUE + r'|bearer[ \t]+[a-z0-9._\-]+')
+_RX_I = re.compile(_RX.pattern, re.I)   # for text whose lowercase form has a different length
+
+def _matches(s: str):
+    low = s.lower()
+    if len(low) != len(s):
+        yield from _RX_I.finditer(s); return
+    # every alternative starts with a keyword, so only try the regex where
+    # str.find says one begins
+    starts = []
+    for k in KEYWORDS:
+        i = low.find(k)
+        while i >= 0:
+            starts.append(i); i = low.find(k, i + 1)
+    pos = 0
+    for i in sorted(starts):
+        if i < pos: continue
+        m = _RX.match(low, i)
+        if m: yield m; pos = m.end()
+
+def _scrub(s: str) -> str:
+    out, pos = [], 0
+    for m in _matches(s):
+        a = m.start()
+        out.append(s[pos:a])
+        out.append(s[a:m.end(1)] + "=REDACTED" if m.lastindex else "Bearer REDACTED")
+        pos = m.end()
+    if not out: return s
+    out.append(s[pos:])
+    return "".join(out)
+
+class Redactor:
+    """Streaming filter: feed() text chunks in, get redacted text out. Output
+    lags input by at most one partial line; close() flushes it."""
+    __slots__ = ("_tail",)
+
+    def __init__(self):
+        self._tail = ""
+
+    def feed(self, chunk: str) -> str:
+        buf = self._tail + chunk if self._tail else chunk
+        cut = buf.rfind("\n") + 1
+        if not cut and len(buf) < MAX_LINE:
+            self._tail = buf; return ""
+        if not cut: cut = len(buf)
+        self._tail = buf[cut:]
+        return _scrub(buf[:cut])
+
+    def close(self) -> str:
+        t, self._tail = self._tail, ""
+        return _scrub(t) if t else ""
+
+def redact(s: str) -> str:
+    """Redacted copy of s, scanned CHUNK characters (whole lines) at a time."""
+    if len(s) <= CHUNK: return _scrub(s)
+    r = Redactor()
+    out = [r.feed(s[i:i + CHUNK]) for i in range(0, len(s), CHUNK)]
+    out.append(r.close())
+    return "".join(out)
+
+def stream(chunks, encoding="utf-8"):
+    """Redacted text for an iterable of bytes (decoded incrementally) or str chunks."""
+    r, dec = Redactor(), codecs.getincrementaldecoder(encoding)(errors="ignore")
+    for c in chunks:
+        out = r.feed(dec.decode(c) if isinstance(c, bytes) else c)
+        if out: yield out
+    out = r.feed(dec.decode(b"", final=True)) + r.close()
+    if out: yield out
@@ -1,32 +1,136 @@
-import os, re, glob
+import os, re, json, math
+from copilot.tools.trace import span
 
 RUNBOOK_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "runbooks")
+INDEX_FILE = ".index.json"
+K1, B = 1.2, 0.75
 
-def keyword_search(query: str, k: int = 3) -> list[dict]:
-    q = query.lower()
-    hits = []
-    for path in glob.glob(os.path.join(RUNBOOK_DIR, "*.md")):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                text = f.read()
-            score = sum(text.lower().count(token) for token in re.findall(r'\w+', q))
-            if score > 0:
-                snippet = _first_snippet(text, q, 260)
-                hits.append({"path": os.path.basename(path), "score": score, "snippet": snippet})
-        except Exception:
-            continue
-    hits.sort(key=lambda x: x["score"], reverse=True)
-    return hits[:k]
-
-def _first_snippet(text: str, q: str, size: int) -> str:
-    if not q.strip():
-        return text[:size] + ("..." if len(text) > size else "")
-    import re as _re
-    tokens = _re.findall(r'\w+', q)
-    token = tokens[0] if tokens else ""
-    idx = text.lower().find(token.lower()) if token else -1
-    if idx == -1:
-        return text[:size] + ("..." if len(text) > size else "")
-    start = max(0, idx - size//2)
-    end = min(len(text), idx + size//2)
+_TOKEN = re.compile(r'\w+')
+_MEMO = {}  # index path -> loaded index (reused while file mtimes are unchanged)
+
+def _scan(root: str) -> dict:
+    out = {}
+    try:
+        with os.scandir(root) as it:
+            for e in it:
+                if e.name.endswith(".md") and e.is_file():
+                    out[e.name] = e.stat().st_mtime_ns
+    except OSError:
+        pass
+    return out
+
+def _read_index(path: str) -> dict | None:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            idx = json.load(f)
+        return idx if idx.get("version") == 1 else None
+    except Exception:
+        return None
+
+def _write_index(path: str, idx: dict) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({k: v for k, v in idx.items() if not k.startswith("_")}, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        # read-only runbook dir: keep the in-memory index only
+        try: os.remove(tmp)
+        except OSError: pass
+
+def _parse(entry: str) -> list:
+    out = []
+    for p in entry.split(","):
+        i, tf, off = p.split(":")
+        out.append((int(i), int(tf), int(off)))
+    return out
+
+def _drop(idx: dict, name: str) -> None:
+    doc = idx["docs"].pop(name)
+    post, did = idx["postings"], doc["id"]
+    for t in doc["terms"].split():
+        kept = [p for p in post.get(t, "").split(",") if p and int(p.split(":", 1)[0]) != did]
+        if kept: post[t] = ",".join(kept)
+        else: post.pop(t, None)
+
+def _add(idx: dict, root: str, name: str, mtime: int, pending: dict) -> None:
+    try:
+        with open(os.path.join(root, name), "r", encoding="utf-8") as f:
+            text = f.read()
+    except Exception:
+        return
+    tf, pos, n = {}, {}, 0
+    for m in _TOKEN.finditer(text.lower()):
+        t = m.group(); n += 1
+        if t in tf: tf[t] += 1
+        else: tf[t] = 1; pos[t] = m.start()  # first occurrence: snippet anchor
+    did = idx["next_id"]; idx["next_id"] += 1
+    for t, c in tf.items():
+        pending.setdefault(t, []).append(f"{did}:{c}:{pos[t]}")
+    idx["docs"][name] = {"id": did, "mtime": mtime, "len": n, "terms": " ".join(tf)}
+
+def load_index(root: str = RUNBOOK_DIR) -> dict:
+    """Inverted index over root/*.md, persisted at root/.index.json.
+
+    Postings are stored per term as compact "doc:tf:offset,..." strings and
+    only parsed for terms a query touches. Only files whose mtime changed (or
+    that were added/removed) since the index was written are re-tokenised."""
+    path = os.path.join(root, INDEX_FILE)
+    idx = _MEMO.get(path) or _read_index(path) or {"version": 1, "next_id": 0, "docs": {}, "postings": {}}
+    files = _scan(root); changed = False; pending = {}
+    for name in [n for n in idx["docs"] if files.get(n) != idx["docs"][n]["mtime"]]:
+        _drop(idx, name); changed = True
+    for name, mtime in files.items():
+        if name not in idx["docs"]:
+            _add(idx, root, name, mtime, pending); changed = True
+    post = idx["postings"]
+    for t, entries in pending.items():
+        post[t] = ",".join(([post[t]] if t in post else []) + entries)
+    if changed or "_names" not in idx:
+        docs = idx["docs"]
+        idx["avgdl"] = (sum(d["len"] for d in docs.values()) / len(docs)) if docs else 0.0
+        if changed:
+            _write_index(path, idx)
+        idx["_names"] = {d["id"]: (n, d["len"]) for n, d in docs.items()}
+        idx["_parsed"] = {}
+    _MEMO[path] = idx
+    return idx
+
+def keyword_search(query: str, k: int = 3, root: str = RUNBOOK_DIR) -> list[dict]:
+    with span("runbooks.search", bytes=len(query)) as s:
+        hits = _search(query, k, root)
+        s.set(items=len(hits))
+        return hits
+
+def _search(query, k, root):
+    idx = load_index(root)
+    post, names, parsed = idx["postings"], idx["_names"], idx["_parsed"]
+    N, avgdl = len(names), idx.get("avgdl") or 1.0
+    scores, best = {}, {}
+    for t in set(_TOKEN.findall(query.lower())):
+        hits = parsed.get(t)
+        if hits is None:
+            entry = post.get(t)
+            if not entry: continue
+            hits = parsed[t] = _parse(entry)
+        idf = math.log(1 + (N - len(hits) + 0.5) / (len(hits) + 0.5))
+        for did, tf, off in hits:
+            dl = names[did][1]
+            s = idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * dl / avgdl))
+            scores[did] = scores.get(did, 0.0) + s
+            # snippet anchors on the most informative matching term
+            if idf > best.get(did, (-1.0, 0))[0]:
+                best[did] = (idf, off)
+    ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k]
+    return [{"path": names[did][0], "score": round(s, 3), "snippet": _snippet(root, names[did][0], best[did][1], 260)}
+            for did, s in ranked]
+
+def _snippet(root: str, name: str, offset: int, size: int) -> str:
+    try:
+        with open(os.path.join(root, name), "r", encoding="utf-8") as f:
+            text = f.read()
+    except Exception:
+        return ""
+    start = max(0, offset - size//2)
+    end = min(len(text), offset + size//2)
     return text[start:end] + ("..." if end < len(text) else "")
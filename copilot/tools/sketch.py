@@ -0,0 +1,173 @@
+import heapq, math
+from statistics import NormalDist
+
+class LogHistogram:
+    """HDR-style latency histogram: log-spaced buckets with relative error
+    `alpha`, so memory depends on the value range (about 1k buckets for
+    1µs..1h at 1%), not on the sample count. Histograms with the same
+    alpha merge exactly by adding bucket counts."""
+    __slots__ = ("alpha", "gamma", "_lg", "counts", "zero", "n", "lo", "hi")
+
+    def __init__(self, alpha: float = 0.01):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._lg = math.log(self.gamma)
+        self.counts = {}     # bucket index -> count; bucket i holds (gamma^(i-1), gamma^i]
+        self.zero = 0        # samples <= 0
+        self.n = 0
+        self.lo, self.hi = math.inf, -math.inf
+
+    def add(self, v: float, k: int = 1):
+        if v != v: return    # NaN
+        self.n += k
+        if v < self.lo: self.lo = v
+        if v > self.hi: self.hi = v
+        if v <= 0: self.zero += k; return
+        i = math.ceil(math.log(v) / self._lg)
+        self.counts[i] = self.counts.get(i, 0) + k
+
+    def add_many(self, values):
+        """Vectorized add for a batch (list or array) of samples."""
+        import numpy as np
+        a = np.array(values, dtype=float)   # None -> NaN
+        a = a[~np.isnan(a)]
+        if not a.size: return
+        self.n += int(a.size)
+        self.lo, self.hi = min(self.lo, float(a.min())), max(self.hi, float(a.max()))
+        pos = a[a > 0]
+        self.zero += int(a.size - pos.size)
+        if not pos.size: return
+        idx = np.ceil(np.log(pos) / self._lg).astype(np.int64)
+        base = int(idx.min())
+        bc = np.bincount(idx - base)
+        c = self.counts
+        for j in np.flatnonzero(bc).tolist():
+            c[base + j] = c.get(base + j, 0) + int(bc[j])
+
+    def merge(self, other: "LogHistogram") -> "LogHistogram":
+        if other.alpha != self.alpha:
+            raise ValueError(f"cannot merge histograms with alpha {self.alpha} and {other.alpha}")
+        for i, k in other.counts.items(): self.counts[i] = self.counts.get(i, 0) + k
+        self.zero += other.zero; self.n += other.n
+        self.lo, self.hi = min(self.lo, other.lo), max(self.hi, other.hi)
+        return self
+
+    def _value(self, i):
+        # midpoint in relative terms: within alpha of anything in the bucket
+        return min(max(2 * self.gamma ** i / (self.gamma + 1), self.lo), self.hi)
+
+    def at_ranks(self, ranks):
+        """Values of the given 1-based order statistics (ranks clamped to 1..n)."""
+        if not self.n: return [None] * len(ranks)
+        want = sorted((min(max(int(r), 1), self.n), j) for j, r in enumerate(ranks))
+        out, seen, w = [None] * len(ranks), self.zero, 0
+        while w < len(want) and want[w][0] <= seen:
+            out[want[w][1]] = 0.0; w += 1
+        for i in sorted(self.counts):
+            seen += self.counts[i]
+            while w < len(want) and want[w][0] <= seen:
+                out[want[w][1]] = self._value(i); w += 1
+            if w == len(want): break
+        return out
+
+    def quantile(self, q: float):
+        return self.at_ranks([math.ceil(q * self.n)])[0]
+
+    def quantile_ci(self, q: float, confidence: float = 0.95):
+        """(estimate, low, high): the order statistics whose ranks bracket the
+        q-quantile at this confidence (normal approximation to the binomial)."""
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        nq, sd = self.n * q, z * math.sqrt(self.n * q * (1 - q))
+        return tuple(self.at_ranks([math.ceil(nq), math.floor(nq - sd), math.ceil(nq + sd) + 1]))
+
+    def to_dict(self) -> dict:
+        return {"alpha": self.alpha, "zero": self.zero, "n": self.n, "lo": self.lo, "hi": self.hi,
+                "counts": {str(i): k for i, k in self.counts.items()}}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "LogHistogram":
+        h = cls(d["alpha"])
+        h.counts = {int(i): k for i, k in d["counts"].items()}
+        h.zero, h.n, h.lo, h.hi = d["zero"], d["n"], d["lo"], d["hi"]
+        return h
+
+class SpaceSaving:
+    """Heavy hitters in fixed memory (Space-Saving): at most `capacity` keys
+    are tracked. A new key replaces the one with the smallest count and
+    inherits that count as its error, so count - err <= true count and any
+    key occurring more than n/capacity times stays tracked. Counts always sum
+    to n, so summing the keys of one template never loses lines. merge()
+    feeds the other sketch's counters in as weighted updates."""
+    __slots__ = ("capacity", "counts", "errs", "heap", "n")
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.counts = {}
+        self.errs = {}       # key -> inherited count, only where nonzero
+        self.heap = []       # (count, key), one per key; lags counts, fixed up lazily on eviction
+        self.n = 0
+
+    def add(self, key, k: int = 1, err: int = 0):
+        self.n += k
+        c = self.counts.get(key)
+        if c is not None:
+            self.counts[key] = c + k
+            if err: self.errs[key] = self.errs.get(key, 0) + err
+            return
+        if len(self.counts) >= self.capacity:
+            floor = self._evict(); err += floor; k += floor
+        self.counts[key] = k
+        if err: self.errs[key] = err
+        heapq.heappush(self.heap, (k, key))
+
+    def update(self, keys):
+        # add() per key, with the common case (already tracked) inlined
+        counts, hits = self.counts, 0
+        for key in keys:
+            c = counts.get(key)
+            if c is None: self.add(key)
+            else: counts[key] = c + 1; hits += 1
+        self.n += hits
+
+    def _evict(self) -> int:
+        heap, counts = self.heap, self.counts
+        while True:
+            c, key = heap[0]
+            cur = counts[key]
+            if cur == c:
+                heapq.heappop(heap); del counts[key]; self.errs.pop(key, None)
+                return c
+            heapq.heapreplace(heap, (cur, key))
+
+    @property
+    def floor(self) -> int:
+        """Upper bound on the count of any key not tracked."""
+        return self._min() if len(self.counts) >= self.capacity else 0
+
+    def _min(self):
+        heap, counts = self.heap, self.counts
+        while heap[0][0] != counts[heap[0][1]]:
+            heapq.heapreplace(heap, (counts[heap[0][1]], heap[0][1]))
+        return heap[0][0]
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        n = self.n + other.n
+        for key, c in sorted(other.counts.items(), key=lambda x: x[1], reverse=True):
+            self.add(key, c, other.errs.get(key, 0))
+        self.n = n
+        return self
+
+    def top(self, k: int | None = None) -> list:
+        """[(key, count, err)], highest count first."""
+        items = heapq.nlargest(k or len(self.counts), self.counts.items(), key=lambda x: x[1])
+        return [(key, c, self.errs.get(key, 0)) for key, c in items]
+
+def two_proportion(x1: int, n1: int, x2: int, n2: int) -> dict:
+    """Pooled two-proportion z-test of x1/n1 vs x2/n2. p_lower is the
+    one-sided p-value for the first proportion being lower."""
+    if min(n1, n2) <= 0: return {"z": None, "p_two_sided": None, "p_lower": None}
+    p = (x1 + x2) / (n1 + n2)
+    se = math.sqrt(p * (1 - p) * (1 / n1 + 1 / n2))
+    if se == 0: return {"z": 0.0, "p_two_sided": 1.0, "p_lower": 0.5}
+    z = (x1 / n1 - x2 / n2) / se
+    return {"z": z, "p_two_sided": math.erfc(abs(z) / math.sqrt(2)), "p_lower": 0.5 * math.erfc(-z / math.sqrt(2))}
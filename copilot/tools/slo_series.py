@@ -0,0 +1,139 @@
+import time
+import numpy as np
+
+# Multi-window, multi-burn-rate alert pairs for a 30-day SLO:
+# (long window min, short window min, burn factor, severity). An alert fires
+# at a step when both windows burn faster than the factor.
+PAIRS = ((60, 5, 14.4, "page"), (360, 30, 6.0, "page"),
+         (1440, 120, 3.0, "ticket"), (4320, 360, 1.0, "ticket"))
+
+def _key(metric): return tuple(sorted(metric.items()))
+
+def matrix(results, start, end, step, keys=None):
+    """Align Prometheus matrix results onto one time grid.
+    Returns (keys, array[series, steps]); missing samples are NaN."""
+    n = int(round((end - start) / step)) + 1
+    if keys is None: keys = sorted({_key(r.get("metric", {})) for r in results})
+    row = {k: i for i, k in enumerate(keys)}
+    m = np.full((len(keys), n), np.nan)
+    for r in results:
+        i = row.get(_key(r.get("metric", {})))
+        if i is None or not r.get("values"): continue
+        v = np.asarray(r["values"], dtype=float)
+        j = np.rint((v[:, 0] - start) / step).astype(np.int64)
+        ok = (j >= 0) & (j < n)
+        m[i, j[ok]] = v[ok, 1]
+    return keys, m
+
+BLOCK = 4   # series evaluated together; keeps each block's working set in cache
+
+def _prefix(x):
+    """Prefix sums along time with a leading zero column, so the sum of the
+    w steps ending at t is c[t+1] - c[t+1-w]. Missing samples count as 0."""
+    c = np.empty((x.shape[0], x.shape[1] + 1)); c[:, 0] = 0.0
+    np.fmax(x, 0.0, out=c[:, 1:])   # fmax drops NaN (and negative noise) in the same pass
+    np.cumsum(c[:, 1:], axis=1, out=c[:, 1:])
+    return c
+
+def _window(c, w, lo=0):
+    """Trailing w-step sums (float32) at every step t >= lo; 0 until a full window exists."""
+    n = c.shape[1] - 1
+    out = np.zeros((c.shape[0], max(n - lo, 0)), np.float32)
+    a = max(lo, w - 1)
+    if a < n: np.subtract(c[:, a + 1:], c[:, a + 1 - w:n + 1 - w], out=out[:, a - lo:], casting="same_kind")
+    return out
+
+def _ratio(ce, ct, w, lo=0):
+    num, den = _window(ce, w, lo), _window(ct, w, lo)
+    return np.divide(num, den, out=np.full_like(num, np.nan), where=den > 0)
+
+def _last(ce, ct, w):
+    # ratio over the final window only, straight from the prefix sums
+    n = ce.shape[1] - 1
+    if w > n: return np.full(len(ce), np.nan)
+    den = ct[:, n] - ct[:, n - w]
+    return np.divide(ce[:, n] - ce[:, n - w], den, out=np.full(len(ce), np.nan), where=den > 0)
+
+def _steps(minutes, step): return max(1, int(round(minutes * 60 / step)))
+
+def burn_rates(err, tot, windows, step, slo_target=0.995):
+    """{window_min: burn[series, steps]} for per-step error and total rates:
+    one prefix sum per input, then one subtraction per window. Burn rate =
+    error ratio / (1 - slo_target); NaN where a window saw no traffic."""
+    ce, ct = _prefix(err), _prefix(tot)
+    return {w: _ratio(ce, ct, _steps(w, step)) / (1.0 - slo_target) for w in windows}
+
+def _eval_block(err, tot, step, budget, pairs, lo):
+    ce, ct = _prefix(err), _prefix(tot)
+    out = []
+    for long_w, short_w, factor, _ in pairs:
+        sl, ss = _steps(long_w, step), _steps(short_w, step)
+        rl = _ratio(ce, ct, sl, lo)
+        firing = rl > factor * budget          # NaN compares False
+        if firing.any():
+            # the short window only matters where the long one already burns
+            firing &= _ratio(ce, ct, ss, lo) > factor * budget
+        last = firing.shape[1] - 1 - np.argmax(firing[:, ::-1], axis=1)
+        out.append((firing[:, -1], firing.sum(axis=1), np.where(firing.any(axis=1), last + lo, -1),
+                    _last(ce, ct, sl) / budget, _last(ce, ct, ss) / budget,
+                    np.fmax.reduce(rl, axis=1).astype(float) / budget))
+    return out
+
+def evaluate(err, tot, step, slo_target=0.995, pairs=PAIRS, from_step=0):
+    """Evaluate every alert pair for every series at every step >= from_step
+    (earlier steps only warm up the long windows). Series are processed in
+    blocks of BLOCK rows; each block is prefix-summed once and every window
+    is a single subtraction over it. Short windows are only computed for
+    blocks where the paired long window fires. Returns one dict of per-series arrays
+    per pair: firing_now, firing_steps, last_step (-1 if never), and the
+    latest/maximum burn rates."""
+    budget = 1.0 - slo_target
+    from_step = min(from_step, err.shape[1] - 1)   # always evaluate at least the last step
+    fields = ("firing_now", "firing_steps", "last_step", "burn_long", "burn_short", "max_burn")
+    parts = [[[] for _ in fields] for _ in pairs]
+    for i in range(0, err.shape[0], BLOCK):
+        for acc, vals in zip(parts, _eval_block(err[i:i + BLOCK], tot[i:i + BLOCK], step, budget, pairs, from_step)):
+            for a, v in zip(acc, vals): a.append(v)
+    out = []
+    for (long_w, short_w, factor, severity), acc in zip(pairs, parts):
+        r = {"long": long_w, "short": short_w, "factor": factor, "severity": severity}
+        for f, a in zip(fields, acc): r[f] = np.concatenate(a) if a else np.empty(0)
+        out.append(r)
+    return out
+
+def _label(m): return ",".join(f"{k}={v}" for k, v in sorted(m.items())) or "{}"
+
+def _f(x): return None if np.isnan(x) else round(float(x), 4)
+
+def alerts(err_q, tot_q, hours=24.0, step=60, slo_target=0.995, pairs=PAIRS,
+           base_url="http://localhost:9090", end=None):
+    """Fetch error/total rate series (e.g. `sum by (service)(rate(...[1m]))`)
+    and evaluate the alert pairs over the last `hours` for every series.
+    Fetches an extra longest-window of history so the first step is valid."""
+    from copilot.tools.prom import range_query
+    end = float(int((time.time() if end is None else end) // step * step))
+    lookback = max(p[0] for p in pairs) * 60
+    start = end - hours * 3600
+    fetch_from = start - lookback
+    tot_res = range_query(tot_q, fetch_from, end, step, base_url)
+    err_res = range_query(err_q, fetch_from, end, step, base_url)
+    keys, tot = matrix(tot_res, fetch_from, end, step)
+    _, err = matrix(err_res, fetch_from, end, step, keys)
+    res = evaluate(err, tot, step, slo_target, pairs, from_step=int(round(lookback / step)))
+    rows = []
+    for i, k in enumerate(keys):
+        ps = []
+        for p in res:
+            last = int(p["last_step"][i])
+            ps.append({"windows": f"{p['long']}m/{p['short']}m", "factor": p["factor"], "severity": p["severity"],
+                       "firing_now": bool(p["firing_now"][i]),
+                       "firing_minutes": round(float(p["firing_steps"][i]) * step / 60, 1),
+                       "last_fired": fetch_from + last * step if last >= 0 else None,
+                       "burn_long": _f(p["burn_long"][i]), "burn_short": _f(p["burn_short"][i]),
+                       "max_burn": _f(p["max_burn"][i])})
+        firing = sorted({p["severity"] for p in ps if p["firing_now"]})
+        rows.append({"series": _label(dict(k)), "firing": firing, "pairs": ps})
+    rank = lambda r: ("page" not in r["firing"], not r["firing"],
+                      -max((p["max_burn"] or 0) for p in r["pairs"]) if r["pairs"] else 0)
+    rows.sort(key=rank)
+    return {"slo_target": slo_target, "start": start, "end": end, "step": step, "series": rows}
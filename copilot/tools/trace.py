@@ -0,0 +1,153 @@
+import contextvars, json, os, threading, time
+from contextlib import contextmanager
+
+# Lightweight in-process tracer. trace() opens a root span; span() nests under
+# whatever span is current in this context and is a no-op when no trace is
+# active, so instrumented tools cost next to nothing outside a traced run.
+# Spans cross thread pools through submit(), which runs the job in a copy of
+# the submitting context. Finished traces are appended as OTLP/JSON
+# (one ExportTraceServiceRequest per line) to TRACE_OTLP_FILE when it is set.
+OTLP_FILE = os.getenv("TRACE_OTLP_FILE")
+SERVICE = os.getenv("OTEL_SERVICE_NAME", "oncall-copilot")
+GROUP_AT = 4   # sibling spans with one name collapse into a single summary line past this many
+NOT_SUMMED = ("exit", "status", "step")
+
+_current = contextvars.ContextVar("copilot_span", default=None)
+_write_lock = threading.Lock()
+
+class Span:
+    __slots__ = ("name", "attrs", "children", "trace_id", "span_id", "start_ns", "end_ns", "_t0", "ms")
+
+    def __init__(self, name, attrs, trace_id):
+        self.name, self.attrs, self.children = name, dict(attrs), []
+        self.trace_id, self.span_id = trace_id, os.urandom(8).hex()
+        self.start_ns, self.end_ns = time.time_ns(), None
+        self._t0, self.ms = time.perf_counter(), None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs); return self
+
+    def add(self, **counts):
+        """Accumulate counters such as bytes= or items=."""
+        for k, v in counts.items(): self.attrs[k] = self.attrs.get(k, 0) + v
+        return self
+
+    def _finish(self):
+        self.ms = (time.perf_counter() - self._t0) * 1000
+        self.end_ns = self.start_ns + int(self.ms * 1e6)
+
+    def to_dict(self) -> dict:
+        d = {"name": self.name, "ms": None if self.ms is None else round(self.ms, 2)}
+        if self.attrs: d["attrs"] = self.attrs
+        if self.children: d["children"] = [c.to_dict() for c in list(self.children)]
+        return d
+
+class _Noop:
+    __slots__ = ()
+    def set(self, **attrs): return self
+    def add(self, **counts): return self
+
+NOOP = _Noop()
+
+def current():
+    return _current.get()
+
+def annotate(**attrs):
+    """Set attributes on the current span, if any."""
+    s = _current.get()
+    if s is not None: s.attrs.update(attrs)
+
+def count(**counts):
+    """Add to counters on the current span, if any."""
+    s = _current.get()
+    if s is not None: s.add(**counts)
+
+def _run(s):
+    tok = _current.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.attrs["error"] = type(e).__name__; raise
+    finally:
+        s._finish(); _current.reset(tok)
+
+@contextmanager
+def span(name: str, **attrs):
+    """Child span of the current one; yields NOOP when nothing is traced."""
+    parent = _current.get()
+    if parent is None:
+        yield NOOP; return
+    s = Span(name, attrs, parent.trace_id)
+    parent.children.append(s)
+    yield from _run(s)
+
+@contextmanager
+def trace(name: str, **attrs):
+    """Root span (or a child, if a trace is already active). A finished root
+    is exported to TRACE_OTLP_FILE when that is set."""
+    parent = _current.get()
+    s = Span(name, attrs, parent.trace_id if parent else os.urandom(16).hex())
+    if parent is not None: parent.children.append(s)
+    try:
+        yield from _run(s)
+    finally:
+        if parent is None and OTLP_FILE: export_otlp(s, OTLP_FILE)
+
+def submit(ex, fn, *args):
+    """ex.submit(fn, *args) with the caller's spans visible to the job."""
+    return ex.submit(contextvars.copy_context().run, fn, *args)
+
+def _value(v):
+    if isinstance(v, bool): return {"boolValue": v}
+    if isinstance(v, int): return {"intValue": str(v)}
+    if isinstance(v, float): return {"doubleValue": v}
+    return {"stringValue": str(v)}
+
+def otlp(root: Span) -> dict:
+    """OTLP/JSON ExportTraceServiceRequest for one finished trace."""
+    spans, stack = [], [(root, None)]
+    while stack:
+        s, parent = stack.pop()
+        o = {"traceId": s.trace_id, "spanId": s.span_id, "name": s.name, "kind": 1,
+             "startTimeUnixNano": str(s.start_ns), "endTimeUnixNano": str(s.end_ns or s.start_ns),
+             "attributes": [{"key": k, "value": _value(v)} for k, v in s.attrs.items()]}
+        if parent: o["parentSpanId"] = parent
+        if "error" in s.attrs: o["status"] = {"code": 2, "message": str(s.attrs["error"])}
+        spans.append(o)
+        stack.extend((c, s.span_id) for c in reversed(list(s.children)))
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE}}]},
+        "scopeSpans": [{"scope": {"name": "copilot.tools.trace"}, "spans": spans}]}]}
+
+def export_otlp(root: Span, path: str):
+    d = os.path.dirname(path)
+    if d: os.makedirs(d, exist_ok=True)
+    line = json.dumps(otlp(root), separators=(",", ":")) + "\n"
+    with _write_lock, open(path, "a", encoding="utf-8") as f: f.write(line)
+
+def _attrs(a):
+    return ", ".join(f"{k}={v}" for k, v in a.items())
+
+def summary(d: dict, depth: int = 0, max_depth: int = 4) -> list[str]:
+    """Markdown bullet lines for a to_dict() tree. Runs of many same-named
+    siblings (per-namespace or per-page spans) collapse into one line with
+    the count, total and max duration and summed counters."""
+    a = f" ({_attrs(d['attrs'])})" if d.get("attrs") else ""
+    ms = "unfinished" if d["ms"] is None else f"{d['ms']:.0f} ms"
+    lines = [f"{'  ' * depth}- {d['name']} {ms}{a}"]
+    if depth >= max_depth: return lines
+    groups = {}
+    for c in d.get("children", []): groups.setdefault(c["name"], []).append(c)
+    for name, cs in groups.items():
+        if len(cs) < GROUP_AT:
+            for c in cs: lines += summary(c, depth + 1, max_depth)
+            continue
+        ms = [c["ms"] or 0 for c in cs]
+        tot = {}
+        for c in cs:
+            for k, v in (c.get("attrs") or {}).items():
+                if isinstance(v, (int, float)) and not isinstance(v, bool) and k not in NOT_SUMMED:
+                    tot[k] = tot.get(k, 0) + v
+        extra = f", {_attrs(tot)}" if tot else ""
+        lines.append(f"{'  ' * (depth + 1)}- {name} ×{len(cs)}: total {sum(ms):.0f} ms, max {max(ms):.0f} ms{extra}")
+    return lines
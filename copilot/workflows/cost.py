@@ -1,5 +1,7 @@
-import json, re
+import json
 from copilot.tools.kubectl_safe import run as k
+from copilot.tools import informer
+from copilot.tools.k8s import stream_pods
 
 def _j(txt:str):
     try: return json.loads(txt)
@@ -22,44 +24,50 @@ def _ratio(req:str|None, lim:str|None):
     if a and b and a > 0: return b / a
     return None
 
+def _failed_scheduling(ns:str|None) -> dict:
+    """Latest FailedScheduling message per pod name, from a single events list."""
+    data = informer.cached("events", ns, reason="FailedScheduling")
+    if data is None:
+        ev = k("get","events",namespace=ns, output="json",
+               extra_args=["--field-selector","reason=FailedScheduling,involvedObject.kind=Pod"])
+        data = _j(ev.get("text","")) if ev.get("ok") else {}
+    latest = {}
+    for e in data.get("items", []):
+        inv = e.get("involvedObject",{}) or {}
+        if inv.get("kind") != "Pod": continue
+        ts = e.get("lastTimestamp") or e.get("eventTime") or e.get("firstTimestamp") or ""
+        name = inv.get("name","")
+        if name not in latest or ts >= latest[name][0]:
+            latest[name] = (ts, (e.get("message") or e.get("note") or "").strip())
+    return {n: (m[:200] or "no scheduler message") for n, (_, m) in latest.items()}
+
 def scan(ns:str|None=None, skew_threshold:float=4.0, restart_threshold:int=5) -> dict:
-    pods = k("get","pods",namespace=ns, output="json")
+    # pod status table streamed from kubectl (or the informer): only name,
+    # phase, container statuses and resources are kept, never the whole list
+    pods = stream_pods(ns)
     if not pods.get("ok"): return {"ok": False, "error": pods.get("error","pods get failed")}
-    data = _j(pods["text"])
-
-    findings = []
-    for item in data.get("items", []):
-        name = item.get("metadata",{}).get("name","")
-        phase = item.get("status",{}).get("phase","")
-        cs = item.get("status",{}).get("containerStatuses",[]) or []
-        spec_ctrs = (item.get("spec",{}) or {}).get("containers",[]) or []
 
+    t = pods["pods"]
+    findings, pending = [], []
+    crashy = set(t.crashy(restart_threshold))
+    for i, name in enumerate(t.name):
         # Crash/backoff waste
-        total_restarts = sum(int(c.get("restartCount",0)) for c in cs)
-        waiting_reasons = [ (c.get("state",{}).get("waiting",{}) or {}).get("reason","") for c in cs ]
-        if total_restarts >= restart_threshold or any("CrashLoopBackOff" in r for r in waiting_reasons):
+        if i in crashy:
             findings.append({
                 "pod": name, "type": "crash/backoff",
-                "detail": f"restarts={total_restarts}, reasons={','.join([r for r in waiting_reasons if r]) or '-'}",
+                "detail": f"restarts={t.restarts[i]}, reasons={','.join(t.reasons(i)) or '-'}",
                 "action": "Inspect previous logs; check probes/images. Consider halting canary."
             })
 
         # Missing requests/limits & skew
-        for c in spec_ctrs:
-            cn = c.get("name","ctr")
-            res = (c.get("resources") or {})
-            req = (res.get("requests") or {})
-            lim = (res.get("limits") or {})
-            # CPU
-            if "cpu" not in req or "cpu" not in lim or "memory" not in req or "memory" not in lim:
+        for cn, r_cpu, r_mem, l_cpu, l_mem in t.containers[i]:
+            if r_cpu is None or l_cpu is None or r_mem is None or l_mem is None:
                 findings.append({
                     "pod": name, "type": "unbounded",
                     "detail": f"container={cn} missing requests/limits",
                     "action": "Set cpu/memory requests & limits to protect cluster and control spend."
                 })
             else:
-                r_cpu, l_cpu = req.get("cpu"), lim.get("cpu")
-                r_mem, l_mem = req.get("memory"), lim.get("memory")
                 rc = _ratio(r_cpu, l_cpu); rm = _ratio(r_mem, l_mem)
                 if (rc and rc >= skew_threshold) or (rm and rm >= skew_threshold):
                     findings.append({
@@ -68,15 +76,19 @@ def scan(ns:str|None=None, skew_threshold:float=4.0, restart_threshold:int=5) ->
                         "action": "Right-size: tighten limits or raise requests closer to observed needs."
                     })
 
-        # Pending due to resources (FailedScheduling)
-        if phase == "Pending":
-            desc = k("describe","pod",name,namespace=ns)
-            line = (desc.get("text") or "").splitlines()
-            hit = next((L for L in line if re.search(r"FailedScheduling", L)), None)
-            if hit:
+        if t.phase[i] == "Pending":
+            pending.append(name)
+
+    # Pending due to resources: one bulk FailedScheduling events list instead
+    # of a describe per pod
+    if pending:
+        sched = _failed_scheduling(ns)
+        for name in pending:
+            ev = sched.get(name)
+            if ev:
                 findings.append({
                     "pod": name, "type": "scheduling",
-                    "detail": "FailedScheduling (possible resource/taint pressure)",
+                    "detail": f"FailedScheduling: {ev}",
                     "action": "Check node resources/taints; adjust requests or cluster size."
                 })
 
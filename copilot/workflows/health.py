@@ -1,12 +1,19 @@
 import json, re
 from copilot.tools.kubectl_safe import run as k
+from copilot.tools import informer
+from copilot.tools.trace import span
 
 def _summarize_events_json(text: str, max_items: int = 8) -> dict:
-    try:
-        obj = json.loads(text)
-    except Exception:
-        return {"count_by_reason": {}, "latest": []}
-    items = obj.get("items", [])
+    with span("parse.events", bytes=len(text)) as s:
+        try:
+            obj = json.loads(text)
+        except Exception:
+            return {"count_by_reason": {}, "latest": []}
+        s.set(items=len(obj.get("items", []) or []))
+        return _summarize_events(obj.get("items", []), max_items)
+
+def _summarize_events(items: list, max_items: int = 8) -> dict:
+    items = list(items)
     # newest first
     def ts(e): return e.get("lastTimestamp") or e.get("eventTime") or e.get("firstTimestamp") or ""
     items.sort(key=ts, reverse=True)
@@ -47,7 +54,12 @@ def _derive_hints(pods_text: str, warn_summary: dict) -> list[str]:
 def health_snapshot(ns: str | None = None) -> dict:
     pods = k("get","pods",namespace=ns)
     nodes = k("get","nodes")
-    events_json = k("get","events",namespace=ns, output="json")
-    warn_summary = _summarize_events_json(events_json.get("text","") or "{}")
+    cached = informer.cached("events", ns)
+    if cached is not None:
+        events_json = {"ok": True, "cmd": "informer:events", "ms": 0, "text": ""}
+        warn_summary = _summarize_events(cached["items"])
+    else:
+        events_json = k("get","events",namespace=ns, output="json")
+        warn_summary = _summarize_events_json(events_json.get("text","") or "{}")
     hints = _derive_hints(pods.get("text","") or "", warn_summary)
     return {"pods": pods, "nodes": nodes, "events": events_json, "warning_summary": warn_summary, "hints": hints}
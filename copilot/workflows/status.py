@@ -1,5 +1,8 @@
+import json, logging, re, time
 from copilot.agent import Agent
 
+log = logging.getLogger(__name__)
+
 TEMPLATE = (
     "You are an SRE drafting a concise stakeholder update. Keep under 600 characters.\n"
     "Include:\n"
@@ -11,7 +14,65 @@ TEMPLATE = (
     "Write the update in one short paragraph (no PII)."
 )
 
+# relative ages ("5m", "3h12m", "(2m ago)") change every run; masking them keeps
+# the prompt, and so its cache key, stable while the cluster state is unchanged
+_AGE = re.compile(r"\(?\b\d+[smhd](?:\d+[smh])?\b(?: ago\))?")
+
+def fallback(context: str) -> str:
+    """Deterministic update built from the health context when the LLM is
+    unavailable: pod states from the pods table, Warning count, first hint."""
+    try: ctx = json.loads(context)
+    except ValueError: ctx = {}
+    rows = [l.split() for l in (ctx.get("pods") or "").splitlines()[1:] if l.strip()]
+    bad = {}
+    for r in rows:
+        if len(r) > 2 and r[2] not in ("Running", "Completed", "Succeeded"):
+            bad[r[2]] = bad.get(r[2], 0) + 1
+    warnings = sum(1 for l in (ctx.get("events") or "").splitlines() if "Warning" in l)
+    impact = (f"{sum(bad.values())} of {len(rows)} pods unhealthy (" +
+              ", ".join(f"{k}×{v}" for k, v in sorted(bad.items())) + ")") if bad else \
+             ("no unhealthy pods observed" if rows else "impact not yet determined")
+    hints = ctx.get("hints") or []
+    action = f"on-call is investigating; next check: {hints[0]}" if hints else "on-call is investigating"
+    msg = (f"Status: investigating degraded service health. Impact: {impact}. "
+           f"Scope: TBD{f'; {warnings} recent Warning events' if warnings else ''}. "
+           f"Action: {action}. Next update: in 30 minutes or sooner if status changes.")
+    return msg[:600]
+
+def _prompt(context: str) -> list:
+    return [{"role":"user","content": TEMPLATE.format(context=_AGE.sub("<age>", context))}]
+
+def draft(context: str, timeout: float | None = None) -> dict:
+    """{"status", "source"}: source is "llm", "cache", or "fallback" when the
+    call errors or misses the deadline."""
+    try:
+        text, source = Agent().complete(_prompt(context), timeout=timeout)
+        if text: return {"status": text, "source": source}
+    except Exception as e:
+        log.warning("status draft falling back to template: %s", e.__class__.__name__)
+    return {"status": fallback(context), "source": "fallback"}
+
+def draft_stream(context: str, on_token, timeout: float | None = None) -> dict:
+    """Like draft(), but hands every token to on_token as it arrives and adds
+    latency metrics: ttft_ms (time to first token) and total_ms. If the call
+    fails before the first token, the template is sent as one token; if it
+    fails mid-stream, the partial text is kept and marked truncated."""
+    a, parts, ttft, t0 = Agent(), [], None, time.perf_counter()
+    source, truncated = "llm", False
+    try:
+        for tok in a.stream(_prompt(context), timeout=timeout):
+            if ttft is None: ttft = (time.perf_counter() - t0) * 1000
+            parts.append(tok); on_token(tok)
+        source = a.source
+    except Exception as e:
+        log.warning("status stream stopped: %s", e.__class__.__name__)
+        truncated = bool(parts)
+    if not parts:
+        source, text = "fallback", fallback(context)
+        ttft = (time.perf_counter() - t0) * 1000
+        on_token(text); parts = [text]
+    return {"status": "".join(parts), "source": source, "truncated": truncated,
+            "ttft_ms": round(ttft, 1), "total_ms": round((time.perf_counter() - t0) * 1000, 1)}
+
 def status_from_context(context: str) -> str:
-    a = Agent()
-    msg = TEMPLATE.format(context=context)
-    return a.chat([{"role":"user","content": msg}])
+    return draft(context)["status"]
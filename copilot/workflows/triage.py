@@ -1,7 +1,7 @@
-from copilot.tools.logs import tail_pod_logs, extract_errors
+from copilot.tools.logs import tail_pod_logs, extract_errors, LogFollower, ErrorWindow
 from copilot.tools.runbooks import keyword_search
 from copilot.tools.kubectl_safe import run as k
-import re
+import re, threading, time
 
 def _warnings_from_describe(pod: str, namespace: str|None):
     d = k("describe","pod", pod, namespace=namespace)
@@ -16,3 +16,32 @@ def triage(pod: str, namespace: str | None = None, lines: int = 500) -> dict:
     query = " ".join(pieces) or "warning unhealthy readiness probe failed liveness http probe"
     runbook_hits = keyword_search(query)
     return {"logs": logs, "top_errors": errors, "warnings": warn_lines[:8], "runbooks": runbook_hits}
+
+def follow(pod: str, namespace: str | None = None, lines: int = 0, window_s: float = 300,
+           top_k: int = 10, refresh_s: float = 1.0):
+    """Stream `kubectl logs -f` into a rolling error window and yield a
+    snapshot every refresh_s seconds until the log stream ends (or the caller
+    stops iterating, which kills kubectl). The last snapshot has running=False;
+    if kubectl can't be started the only one is {"ok": False, "error": ...}."""
+    try:
+        src = LogFollower(pod, namespace, lines)
+    except OSError as e:
+        yield {"ok": False, "pod": pod, "namespace": namespace, "error": str(e)}; return
+    w = ErrorWindow(window_s, bucket_s=max(1.0, window_s / 30))
+    done = threading.Event()
+    def pump():
+        try:
+            for line in src: w.add(line)
+        finally:
+            done.set()
+    threading.Thread(target=pump, name="log-follow", daemon=True).start()
+    started = time.monotonic()
+    def snap(running):
+        return {"ok": True, "pod": pod, "namespace": namespace, "window_s": window_s, "lines": w.lines, "errors": w.errors,
+                "elapsed_s": round(time.monotonic() - started, 1), "running": running, "top_errors": w.top(top_k)}
+    try:
+        while not done.wait(refresh_s):
+            yield snap(True)
+        yield dict(snap(False), exit=src.close())
+    finally:
+        src.close()
@@ -0,0 +1,133 @@
+import json, os, random
+# Deterministic synthetic inputs for scripts/bench_hot.py: pod lists, event
+# lists, log bodies and runbooks shaped like kubectl/Loki output. Same seed ->
+# same bytes, so results are comparable across runs and machines.
+
+SEED = 1234
+REASONS_WAIT = ("", "", "", "", "CrashLoopBackOff", "ImagePullBackOff", "ContainerCreating")
+EVENT_REASONS = ("BackOff", "Unhealthy", "FailedScheduling", "FailedMount", "Pulled", "Killing", "Started")
+LOG_TEMPLATES = (
+    "INFO request served path=/api/v1/orders/{n} status=200 in {ms}ms",
+    "INFO cache hit key=user:{n} ttl={ms}",
+    "DEBUG span {hex} finished in {ms}ms",
+    "WARN slow query took {ms}ms table=orders id={n}",
+    "ERROR upstream timeout after {ms}ms calling payments-{n}.svc:8080",
+    "ERROR failed to connect to db host 10.0.{b}.{c}:5432: connection refused",
+    "Exception in thread worker-{b}: java.lang.NullPointerException at Order.java:{n}",
+    "error: token refresh failed for client {hex}",
+    "INFO login ok user={n} password=hunter{n} api_key={hex}",
+    "INFO outbound call Authorization: Bearer {hex}.{hex}",
+)
+
+def _hex(r, n=16): return "%0*x" % (n, r.getrandbits(4 * n))
+
+def pods(n, seed=SEED, namespaces=20, verbose=False):
+    """`kubectl get pods -o json`-shaped dict with n pods. verbose=True adds
+    the bulk real API objects carry (labels, annotations, managedFields,
+    env, volumes, conditions), about 4 KB per pod."""
+    r = random.Random(seed)
+    items = []
+    for i in range(n):
+        ctrs = r.choice((1, 1, 1, 2, 3))
+        wait = [r.choice(REASONS_WAIT) for _ in range(ctrs)]
+        phase = "Pending" if r.random() < 0.02 else "Running"
+        statuses = [{"name": f"c{j}", "ready": not w, "restartCount": r.choice((0, 0, 0, 1, 3, 12)),
+                     "state": {"waiting": {"reason": w}} if w else {"running": {"startedAt": "2025-01-01T00:00:00Z"}}}
+                    for j, w in enumerate(wait)]
+        spec = []
+        for j in range(ctrs):
+            res = {}
+            if r.random() < 0.8:
+                cpu = r.choice((50, 100, 250, 500))
+                mem = r.choice((64, 128, 256, 512))
+                res = {"requests": {"cpu": f"{cpu}m", "memory": f"{mem}Mi"},
+                       "limits": {"cpu": f"{cpu * r.choice((1, 2, 8))}m", "memory": f"{mem * r.choice((1, 2, 4))}Mi"}}
+            spec.append({"name": f"c{j}", "image": f"registry/app-{i % 50}:1.{j}", "resources": res})
+        item = {"metadata": {"name": f"app-{i % 500}-{_hex(r, 10)}", "namespace": f"ns-{i % namespaces}",
+                             "ownerReferences": [{"kind": "ReplicaSet", "name": f"app-{i % 500}-rs"}]},
+                "spec": {"containers": spec},
+                "status": {"phase": phase, "containerStatuses": [] if phase == "Pending" else statuses}}
+        if verbose: _bulk(r, item, i)
+        items.append(item)
+    return {"apiVersion": "v1", "kind": "List", "items": items}
+
+def _bulk(r, item, i):
+    md, spec, st = item["metadata"], item["spec"], item["status"]
+    md.update({"uid": f"{_hex(r, 8)}-{_hex(r, 4)}-{_hex(r, 4)}-{_hex(r, 4)}-{_hex(r, 12)}",
+               "resourceVersion": str(r.randrange(10 ** 9)), "creationTimestamp": "2025-01-01T00:00:00Z",
+               "labels": {"app": f"app-{i % 500}", "pod-template-hash": _hex(r, 10), "team": f"team-{i % 12}"},
+               "annotations": {"kubectl.kubernetes.io/restartedAt": "2025-01-01T00:00:00Z",
+                               "prometheus.io/scrape": "true", "checksum/config": _hex(r, 64)},
+               "managedFields": [{"manager": m, "operation": "Update", "apiVersion": "v1",
+                                  "time": "2025-01-01T00:00:00Z", "fieldsType": "FieldsV1",
+                                  "fieldsV1": {"f:metadata": {"f:labels": {f"f:{k}": {} for k in ("app", "team", "pod-template-hash")}},
+                                               "f:spec": {"f:containers": {f'k:{{"name":"c{j}"}}': {"f:image": {}, "f:resources": {}}
+                                                                           for j in range(len(spec["containers"]))}}}}
+                                 for m in ("kube-controller-manager", "kubelet")]})
+    for c in spec["containers"]:
+        c["env"] = [{"name": f"VAR_{k}", "value": _hex(r, 12)} for k in range(8)]
+        c["volumeMounts"] = [{"name": "kube-api-access", "mountPath": "/var/run/secrets/kubernetes.io/serviceaccount", "readOnly": True}]
+        c["ports"] = [{"containerPort": 8080, "protocol": "TCP"}]
+        c["livenessProbe"] = {"httpGet": {"path": "/healthz", "port": 8080}, "periodSeconds": 10}
+    spec.update({"nodeName": f"node-{r.randrange(200)}", "serviceAccountName": "default", "restartPolicy": "Always",
+                 "volumes": [{"name": "kube-api-access", "projected": {"sources": [{"serviceAccountToken": {"path": "token"}}]}}],
+                 "tolerations": [{"key": "node.kubernetes.io/not-ready", "operator": "Exists", "effect": "NoExecute"}]})
+    st.update({"hostIP": f"10.0.{r.randrange(256)}.{r.randrange(256)}", "podIP": f"10.1.{r.randrange(256)}.{r.randrange(256)}",
+               "startTime": "2025-01-01T00:00:00Z", "qosClass": "Burstable",
+               "conditions": [{"type": t, "status": "True", "lastTransitionTime": "2025-01-01T00:00:00Z"}
+                              for t in ("Initialized", "Ready", "ContainersReady", "PodScheduled")]})
+
+def events(n, seed=SEED, pod_names=None):
+    """`kubectl get events -o json`-shaped dict with n events (about half Warnings)."""
+    r = random.Random(seed + 1)
+    items = []
+    for i in range(n):
+        reason = r.choice(EVENT_REASONS)
+        name = r.choice(pod_names) if pod_names else f"app-{i % 500}-{_hex(r, 10)}"
+        items.append({"type": "Warning" if reason in EVENT_REASONS[:4] else "Normal", "reason": reason,
+                      "involvedObject": {"kind": "Pod", "name": name},
+                      "lastTimestamp": f"2025-01-01T{r.randrange(24):02d}:{r.randrange(60):02d}:{r.randrange(60):02d}Z",
+                      "message": f"{reason}: 0/{r.randrange(3, 50)} nodes are available: insufficient cpu"
+                                 if reason == "FailedScheduling" else f"{reason} for container c0 ({_hex(r, 8)})"})
+    return {"apiVersion": "v1", "kind": "List", "items": items}
+
+def log_lines(n, seed=SEED):
+    """n log lines mixing info noise, error templates and secrets to redact."""
+    r = random.Random(seed + 2)
+    weights = (30, 15, 15, 8, 6, 5, 4, 4, 2, 2)
+    picks = r.choices(LOG_TEMPLATES, weights, k=n)
+    return [f"2025-01-01T00:00:{i % 60:02d}Z " + t.format(n=r.randrange(100000), ms=r.randrange(1, 5000),
+                                                       hex=_hex(r), b=r.randrange(256), c=r.randrange(256))
+            for i, t in enumerate(picks)]
+
+def log_text(n, seed=SEED):
+    return "\n".join(log_lines(n, seed)) + "\n"
+
+WORDS = ("pod crashloop backoff oom killed memory limit probe liveness readiness timeout dns "
+         "image pull registry secret node pressure disk evicted taint toleration scheduler cpu "
+         "throttling latency error rate rollback canary deploy ingress tls certificate expired "
+         "database connection pool exhausted retry queue lag kafka consumer").split()
+
+def runbooks(root, n=500, seed=SEED):
+    """Write n markdown runbooks of ~300 words each under root (idempotent)."""
+    r = random.Random(seed + 3)
+    os.makedirs(root, exist_ok=True)
+    for i in range(n):
+        path = os.path.join(root, f"rb-{i:05d}.md")
+        body = f"# Runbook {i}: {' '.join(r.sample(WORDS, 3))}\n\n" + \
+               "\n".join(" ".join(r.choices(WORDS, k=15)) + "." for _ in range(20)) + "\n"
+        if not os.path.exists(path):
+            with open(path, "w", encoding="utf-8") as f: f.write(body)
+    return root
+
+def queries(n, seed=SEED):
+    r = random.Random(seed + 4)
+    return [" ".join(r.sample(WORDS, r.randrange(2, 6))) for _ in range(n)]
+
+if __name__ == "__main__":
+    # usage: python scripts/bench_gen.py <pods|events|logs> <n>  (writes to stdout)
+    import sys
+    kind, n = sys.argv[1], int(sys.argv[2])
+    if kind == "logs": sys.stdout.write(log_text(n))
+    elif kind == "pods": json.dump(pods(n, verbose=os.getenv("VERBOSE") == "1"), sys.stdout)
+    else: json.dump(events(n), sys.stdout)
@@ -0,0 +1,174 @@
+import argparse, gc, json, os, platform, statistics, sys, time, tracemalloc
+# usage: python scripts/bench_hot.py run [--scale quick|full] [--out FILE] [--only a,b]
+#        python scripts/bench_hot.py compare BASELINE RESULT
+# Throughput and peak-memory benchmarks for the hot paths, on deterministic
+# synthetic inputs from scripts/bench_gen.py. `compare` exits 1 when a case
+# loses more than BENCH_TPUT_TOL throughput or grows its peak memory by more
+# than BENCH_MEM_TOL against the baseline (bench/baseline-<scale>.json).
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT); sys.path.insert(0, os.path.join(ROOT, "scripts"))
+import bench_gen as gen
+
+RUNS = int(os.getenv("RUNS", "5"))
+TPUT_TOL = float(os.getenv("BENCH_TPUT_TOL", "0.15"))
+MEM_TOL = float(os.getenv("BENCH_MEM_TOL", "0.20"))
+SCALES = {"quick": {"pods": 10_000, "events": 10_000, "lines": 100_000, "runbooks": 200, "queries": 500},
+          "full": {"pods": 100_000, "events": 100_000, "lines": 1_000_000, "runbooks": 1000, "queries": 2000}}
+
+# Each case: setup(sizes) -> (fn, items, unit). Inputs are built in setup so
+# neither the timing nor the memory peak includes generating them.
+def extract_errors(s):
+    from copilot.tools.logs import extract_errors
+    text = gen.log_text(s["lines"])
+    return (lambda: extract_errors(text, 5)), s["lines"], "lines"
+
+def sample_error_signatures(s):
+    from copilot.tools import loki
+    lines = [l for l in gen.log_lines(s["lines"]) if "ERROR" in l]
+    loki.iter_range = lambda *a, **k: ((0, {}, l) for l in lines)   # Loki paging itself is not measured
+    return (lambda: loki.sample_error_signatures("bench", 5, "http://bench", 5)), len(lines), "lines"
+
+def fleet_signatures(s):
+    # per-pod sketches merged per namespace: 20 namespaces x 25 pods each
+    from copilot.tools import loki
+    rows = [(0, {"namespace": f"ns-{i % 20}", "pod": f"app-{i % 500}"}, l)
+            for i, l in enumerate(gen.log_lines(s["lines"])) if "ERROR" in l]
+    loki.iter_range = lambda *a, **k: iter(rows)
+    return (lambda: loki.error_signatures_by_namespace(5, "http://bench", limit=10)), len(rows), "lines"
+
+def keyword_search(s):
+    from copilot.tools.runbooks import keyword_search
+    root = gen.runbooks(os.path.join(ROOT, "out", "bench", f"runbooks-{s['runbooks']}"), s["runbooks"])
+    qs = gen.queries(s["queries"])
+    keyword_search(qs[0], 3, root)   # index built and memoised outside the timing
+    return (lambda: [keyword_search(q, 3, root) for q in qs]), len(qs), "queries"
+
+def summarize_events_json(s):
+    from copilot.workflows.health import _summarize_events_json
+    text = json.dumps(gen.events(s["events"]))
+    return (lambda: _summarize_events_json(text)), s["events"], "events"
+
+def _fake_kubectl(name, data):
+    # kubectl stand-in that prints a canned `get ... -o json` body
+    d = os.path.join(ROOT, "out", "bench"); os.makedirs(d, exist_ok=True)
+    body, exe = os.path.join(d, f"{name}.json"), os.path.join(d, f"kubectl-{name}")
+    with open(body, "w", encoding="utf-8") as f: json.dump(data, f)
+    with open(exe, "w") as f: f.write(f"#!/bin/sh\nexec cat '{body}'\n")
+    os.chmod(exe, 0o755)
+    from copilot.tools import informer
+    informer.KUBECTL = exe
+    informer.cached = lambda *a, **k: None
+
+def pods_stream(s):
+    from copilot.tools.k8s import pod_table
+    _fake_kubectl(f"pods-verbose-{s['pods']}", gen.pods(s["pods"], verbose=True))
+    return (lambda: pod_table("bench")), s["pods"], "pods"
+
+def cost_scan(s):
+    from copilot.workflows import cost
+    data = gen.pods(s["pods"])
+    names = [p["metadata"]["name"] for p in data["items"] if p["status"]["phase"] == "Pending"]
+    ev = json.dumps(gen.events(s["events"] // 10, pod_names=names or None))
+    _fake_kubectl(f"pods-{s['pods']}", data)
+    cost.k = lambda action, kind, **kw: {"ok": True, "cmd": f"bench {kind}", "ms": 0, "text": ev}
+    return (lambda: cost.scan("bench")), s["pods"], "pods"
+
+def worst_pod(s):
+    from copilot.tools.k8s import worst_pod
+    from copilot.tools.podrecords import PodTable, project
+    data = PodTable(project(gen.pods(s["pods"])["items"]))
+    return (lambda: worst_pod("bench", data)), s["pods"], "pods"
+
+def redact(s):
+    from copilot.tools.redact import redact
+    text = gen.log_text(s["lines"])
+    return (lambda: redact(text)), s["lines"], "lines"
+
+def redact_stream(s):
+    # kubectl/Loki-sized 64 KB byte chunks through the streaming filter, in MB
+    from copilot.tools.redact import stream
+    data = gen.log_text(s["lines"]).encode()
+    chunks = [data[i:i + 65536] for i in range(0, len(data), 65536)]
+    return (lambda: sum(map(len, stream(chunks)))), round(len(data) / 1e6, 3), "MB"
+
+CASES = {f.__name__: f for f in (extract_errors, sample_error_signatures, fleet_signatures, keyword_search,
+                                  summarize_events_json, pods_stream, cost_scan, worst_pod, redact,
+                                  redact_stream)}
+
+def measure(setup, sizes):
+    fn, items, unit = setup(sizes)
+    fn()   # warm-up: imports, regex compilation, caches
+    ts = []
+    for _ in range(RUNS):
+        gc.collect(); t = time.perf_counter(); fn(); ts.append(time.perf_counter() - t)
+    gc.collect(); tracemalloc.start()
+    try:
+        fn(); peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    sec = statistics.median(ts)
+    return {"items": items, "unit": unit, "seconds": round(sec, 6), "per_s": round(items / sec, 1),
+            "peak_kb": round(peak / 1024, 1)}
+
+def run(scale, only=None):
+    sizes = SCALES[scale]
+    out = {"meta": {"scale": scale, "sizes": sizes, "runs": RUNS, "python": platform.python_version(),
+                    "machine": platform.machine(), "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())},
+           "cases": {}}
+    for name, setup in CASES.items():
+        if only and name not in only: continue
+        r = out["cases"][name] = measure(setup, sizes)
+        print(f"{name:<26} {r['per_s']:>14,.0f} {r['unit']}/s  {r['seconds'] * 1000:>9.1f} ms  peak {r['peak_kb'] / 1024:>8.1f} MiB",
+              file=sys.stderr)
+    return out
+
+def compare(base, new):
+    """(rows, regressions): per case throughput and peak-memory ratios vs the baseline."""
+    rows, bad = [], []
+    for name, n in new["cases"].items():
+        b = base["cases"].get(name)
+        if b is None:
+            rows.append((name, None, None, "new")); continue
+        tput = n["per_s"] / b["per_s"] if b["per_s"] else 1.0
+        mem = n["peak_kb"] / b["peak_kb"] if b["peak_kb"] else 1.0
+        flags = []
+        if tput < 1 - TPUT_TOL: flags.append(f"throughput -{(1 - tput) * 100:.0f}%")
+        if mem > 1 + MEM_TOL: flags.append(f"memory +{(mem - 1) * 100:.0f}%")
+        if flags: bad.append(name)
+        rows.append((name, tput, mem, ", ".join(flags) or "ok"))
+    return rows, bad
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Hot-path benchmarks")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("run")
+    r.add_argument("--scale", choices=sorted(SCALES), default="quick")
+    r.add_argument("--out", help="write results JSON here (default: stdout)")
+    r.add_argument("--only", help="comma-separated case names: " + ",".join(CASES))
+    c = sub.add_parser("compare")
+    c.add_argument("baseline"); c.add_argument("result")
+    a = ap.parse_args(argv)
+    if a.cmd == "run":
+        res = run(a.scale, set(a.only.split(",")) if a.only else None)
+        text = json.dumps(res, indent=2) + "\n"
+        if a.out:
+            os.makedirs(os.path.dirname(os.path.abspath(a.out)), exist_ok=True)
+            with open(a.out, "w", encoding="utf-8") as f: f.write(text)
+        else:
+            sys.stdout.write(text)
+        return 0
+    with open(a.baseline, encoding="utf-8") as f: base = json.load(f)
+    with open(a.result, encoding="utf-8") as f: new = json.load(f)
+    if base["meta"].get("sizes") != new["meta"].get("sizes"):
+        print(f"warning: sizes differ ({base['meta'].get('scale')} vs {new['meta'].get('scale')})")
+    rows, bad = compare(base, new)
+    print(f"{'case':<26} {'throughput':>10} {'peak mem':>9}  status")
+    for name, tput, mem, status in rows:
+        fmt = lambda x: "-" if x is None else f"{x:.2f}x"
+        print(f"{name:<26} {fmt(tput):>10} {fmt(mem):>9}  {status}")
+    print(f"\n{len(bad)} regression(s) (tolerance: throughput -{TPUT_TOL:.0%}, memory +{MEM_TOL:.0%})")
+    return 1 if bad else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
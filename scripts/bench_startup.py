@@ -0,0 +1,35 @@
+import os, sys, subprocess, statistics, time
+# usage: python scripts/bench_startup.py
+# Import-time regression check for cheap CLI commands. Fails (exit 1) if
+# `cli.py slo-burn --json` pulls in a heavy module, or if its median startup
+# overhead over a bare interpreter exceeds STARTUP_BUDGET_MS.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CMD = ["cli.py", "slo-burn", "--error-rate", "0.01", "--json"]
+HEAVY = ("openai", "requests", "yaml", "numpy", "agent", "copilot.workflows", "copilot.agent")
+BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "300"))
+RUNS = int(os.getenv("RUNS", "7"))
+
+def median_ms(args):
+    ts = []
+    for _ in range(RUNS):
+        t = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, check=True)
+        ts.append((time.perf_counter() - t) * 1000)
+    return statistics.median(ts)
+
+def heavy_imports():
+    p = subprocess.run([sys.executable, "-X", "importtime", *CMD], cwd=ROOT, capture_output=True, text=True)
+    mods = {l.rsplit("|", 1)[-1].strip() for l in p.stderr.splitlines() if l.startswith("import time:")}
+    return sorted(m for m in mods if any(m == h or m.startswith(h + ".") for h in HEAVY))
+
+bare = median_ms(["-c", "pass"])
+cli = median_ms(CMD)
+heavy = heavy_imports()
+overhead = cli - bare
+print(f"slo-burn --json: median {cli:.0f} ms (bare interpreter {bare:.0f} ms, overhead {overhead:.0f} ms, budget {BUDGET_MS:.0f} ms)")
+if heavy:
+    print("heavy modules imported: " + ", ".join(heavy))
+if heavy or overhead > BUDGET_MS:
+    sys.exit(1)
+print("OK")
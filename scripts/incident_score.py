@@ -1,26 +1,23 @@
-import os, subprocess, requests, statistics, json
+import os, sys, statistics
 from datetime import datetime, timezone
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from copilot.tools.httpclient import get
+from copilot.tools.k8s import pod_table
+from copilot.tools.prom import window_mean
+
 PROM = os.getenv("PROM_URL", "http://127.0.0.1:9090")
 LOKI = os.getenv("LOKI_URL", "http://127.0.0.1:3100")
 NS   = os.getenv("NS", "default")
 
-def prom(q: str) -> float:
-    r = requests.get(f"{PROM}/api/v1/query", params={"query": q}, timeout=8)
-    r.raise_for_status()
-    d = r.json().get("data", {}).get("result", [])
-    if not d:
-        return 0.0
-    v = d[0].get("value", ["", "0"])[1]
-    try:
-        return float(v)
-    except Exception:
-        return 0.0
+def prom_ratio(err_q: str, tot_q: str, window_min: int = 5) -> float:
+    # 1m rates averaged over the window through the local range cache
+    t = window_mean(tot_q, window_min, base_url=PROM)
+    return window_mean(err_q, window_min, base_url=PROM) / t if t > 0 else 0.0
 
 def loki_rate() -> dict:
     q = f'sum by (pod) (rate({{namespace="{NS}"}} |= "ERROR" [5m]))'
-    r = requests.get(f"{LOKI}/loki/api/v1/query", params={"query": q}, timeout=8)
-    r.raise_for_status()
+    r = get(f"{LOKI}/loki/api/v1/query", params={"query": q}, endpoint="loki")
     res = r.json().get("data", {}).get("result", [])
     out = {}
     for s in res:
@@ -33,14 +30,8 @@ def loki_rate() -> dict:
     return out
 
 def restarts() -> dict:
-    j = subprocess.check_output(["kubectl", "-n", NS, "get", "pods", "-o", "json"], text=True)
-    data = json.loads(j).get("items", [])
-    m = {}
-    for it in data:
-        pod = it.get("metadata", {}).get("name", "")
-        st  = (it.get("status", {}).get("containerStatuses") or [{}])[0]
-        m[pod] = int(st.get("restartCount", 0) or 0)
-    return m
+    # total over every container, same numbers as the agent's crash check
+    return pod_table(NS).restarts_by_pod()
 
 def zscores(x: dict) -> dict:
     vals = [v for v in x.values() if v is not None]
@@ -51,7 +42,7 @@ def zscores(x: dict) -> dict:
     return {k: (v - mu) / sd for k, v in x.items()}
 
 # Inputs
-err_pct = 100 * prom('(sum(rate(apiserver_request_total{code=~"5.."}[5m])) or on() vector(0)) / clamp_min(sum(rate(apiserver_request_total[5m])), 1e-12)')
+err_pct = 100 * prom_ratio('sum(rate(apiserver_request_total{code=~"5.."}[1m]))', 'sum(rate(apiserver_request_total[1m]))')
 rates   = loki_rate()
 rests   = restarts()
 zr      = zscores(rates)
@@ -0,0 +1,71 @@
+import json, os, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+# usage: python scripts/openai_stub.py [port]
+# Minimal OpenAI-compatible server for exercising the LLM paths offline:
+#   OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=stub python cli.py status-draft
+# STUB_DELAY_S delays every answer; STUB_STALL=1 never answers (timeout/fallback path).
+# "stream": true requests get SSE chunks, one word each, STUB_TOKEN_DELAY_S apart.
+# GET /stats returns how many completions were requested.
+
+DELAY_S = float(os.getenv("STUB_DELAY_S", "0"))
+STALL = os.getenv("STUB_STALL", "0") == "1"
+TOKEN_DELAY_S = float(os.getenv("STUB_TOKEN_DELAY_S", "0.02"))
+STATS = {"completions": 0}
+_lock = threading.Lock()
+
+def answer(messages):
+    user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    return f"Stub update: investigating; context was {len(user)} chars. Next update: TBD."
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    def log_message(self, *a): pass
+
+    def _json(self, code, obj):
+        body = json.dumps(obj).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json"); self.send_header("Content-Length", str(len(body)))
+        self.end_headers(); self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/stats"): self._json(200, STATS)
+        else: self._json(404, {"error": "not found"})
+
+    def do_POST(self):
+        req = json.loads(self.rfile.read(int(self.headers.get("Content-Length", "0") or 0)) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            return self._json(404, {"error": {"message": "not found"}})
+        with _lock: STATS["completions"] += 1
+        if STALL:
+            time.sleep(3600); return
+        time.sleep(DELAY_S)
+        text = answer(req.get("messages", []))
+        if req.get("stream"):
+            return self._stream(req, text)
+        self._json(200, {"id": "stub-1", "object": "chat.completion", "created": int(time.time()),
+                         "model": req.get("model", "stub"),
+                         "choices": [{"index": 0, "finish_reason": "stop",
+                                      "message": {"role": "assistant", "content": text}}],
+                         "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}})
+
+    def _stream(self, req, text):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream"); self.send_header("Connection", "close")
+        self.end_headers()
+        words = text.split(" ")
+        for i, w in enumerate(words):
+            chunk = {"id": "stub-1", "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": req.get("model", "stub"),
+                     "choices": [{"index": 0, "delta": {"content": w + (" " if i < len(words) - 1 else "")},
+                                  "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode()); self.wfile.flush()
+            time.sleep(TOKEN_DELAY_S)
+        self.wfile.write(b"data: [DONE]\n\n"); self.wfile.flush()
+        self.close_connection = True
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8089
+    srv = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    srv.daemon_threads = True
+    print(f"OpenAI stub on http://127.0.0.1:{port}/v1")
+    srv.serve_forever()
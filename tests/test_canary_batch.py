@@ -0,0 +1,28 @@
+import io, json
+from copilot.tools.canary_batch import run
+
+OK = {"co": 990, "ct": 1000, "bo": 990, "bt": 1000, "cp95": 300, "bp95": 300}
+
+def _run(records):
+    out = io.StringIO()
+    lines = [r if isinstance(r, str) else json.dumps(r) for r in records]
+    n, held, bad = run(lines, {}, out.write)
+    return [json.loads(l) for l in out.getvalue().splitlines()], n, held, bad
+
+def test_bad_row_fails_only_itself():
+    res, n, held, bad = _run([
+        dict(OK, service="a"),
+        dict(OK, service="x", co="NaN?"),
+        dict(OK, service="l", ct=[1, 2]),
+        dict(OK, service="s", co="990", ct="1000"),
+        "{oops",
+        dict(OK, service="b", co=900),
+    ])
+    assert [r.get("service") for r in res] == ["a", "x", "l", "s", None, "b"]
+    assert res[0]["decision"] == "Continue"
+    assert res[1] == {"service": "x", "error": "invalid field co"}
+    assert res[2] == {"service": "l", "error": "invalid field ct"}
+    assert res[3]["decision"] == "Continue"
+    assert res[4] == {"line": 5, "error": "invalid json"}
+    assert res[5]["decision"] == "Hold canary"
+    assert (n, held, bad) == (6, 4, 1)
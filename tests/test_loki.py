@@ -0,0 +1,38 @@
+import json
+from functools import partial
+from copilot.tools import loki
+
+class _Page:
+    def __init__(self, body): self.body = body.encode()
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+    def iter_content(self, n): return iter([self.body])
+
+def _fake_loki(monkeypatch, per_page, step=10):
+    # every page is full, so paging only stops at the window end or the cap
+    def get(url, params, **kw):
+        t0 = int(params["start"])
+        values = [[str(t0 + i * step), f"ERROR boom {i}"] for i in range(1, per_page + 1)]
+        return _Page(json.dumps({"data": {"result": [{"stream": {"namespace": "a", "pod": "p"}, "values": values}]}}))
+    monkeypatch.setattr(loki, "get", get)
+
+def test_iter_range_reports_page_cap(monkeypatch):
+    _fake_loki(monkeypatch, per_page=3)
+    meta = {}
+    rows = list(loki.iter_range("q", 0, 10_000, page=3, max_pages=2, meta=meta))
+    assert len(rows) == 6
+    assert meta == {"truncated": True, "last_ts": 60}
+
+def test_iter_range_covers_window(monkeypatch):
+    _fake_loki(monkeypatch, per_page=3)
+    meta = {}
+    list(loki.iter_range("q", 0, 50, page=3, max_pages=10, meta=meta))
+    assert meta == {"truncated": False, "last_ts": None}
+
+def test_signatures_carry_truncation(monkeypatch):
+    _fake_loki(monkeypatch, per_page=3)
+    # defaults are bound at definition, so cap the pages through a partial
+    monkeypatch.setattr(loki, "iter_range", partial(loki.iter_range, page=3, max_pages=1))
+    sigs = loki.sample_error_signatures("a", 5, "http://loki")
+    assert sigs.truncated and sigs.last_ts is not None
+    assert loki.error_signatures_by_namespace(5, "http://loki")["a"].truncated